@@ -40,7 +40,7 @@ from .tools.md_simulations import MDSimulation
 from .tools.mutagenesis import Mutagenesis
 from .tools.pdb import DownloadPDBStructure, FindPDBStructure
 from .tools.rxnaamapper import ExtractBindingSites, GetElementsOfReaction
-from .utils.assistant_utils import create_agent
+from .utils.assistant_utils import SemanticCache, create_agent
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
@@ -82,13 +82,34 @@ class BiocatalysisAssistant:
         provider: str = "huggingface",
         use_memory: bool = True,
         model_kwargs: Optional[Dict[str, Any]] = None,
+        memory_window: Optional[int] = None,
+        memory_max_tokens: Optional[int] = None,
+        semantic_cache: Optional[SemanticCache] = None,
     ):
-        """Initialize an agent with a dynamic set of tools."""
+        """Initialize an agent with a dynamic set of tools.
+
+        Args:
+            tool_names: names of the tools to load, all tools when None.
+            model: name of the LLM.
+            provider: provider of the LLM.
+            use_memory: whether to keep the conversation history.
+            model_kwargs: additional arguments for the LLM.
+            memory_window: number of past exchanges sent to the LLM, None keeps the
+                whole history.
+            memory_max_tokens: token budget of the history sent to the LLM, takes
+                precedence over memory_window when set.
+            semantic_cache: cache answering questions similar to previous ones,
+                None disables it.
+        """
         self.tool_list: List[BaseTool] = []
+        self._batch_agent: Optional[AgentExecutor] = None
         self.model = model
         self.provider = provider
         self.use_memory = use_memory
         self.model_kwargs = model_kwargs
+        self.memory_window = memory_window
+        self.memory_max_tokens = memory_max_tokens
+        self.semantic_cache = semantic_cache
 
         logger.info(
             f"Initializing BiocatalysisAssistant with model={model}, provider={provider}"
@@ -151,10 +172,76 @@ class BiocatalysisAssistant:
 
         try:
             agent = create_agent(
-                tools=self.tool_list, llm=llm, use_memory=self.use_memory
+                tools=self.tool_list,
+                llm=llm,
+                use_memory=self.use_memory,
+                memory_window=self.memory_window,
+                memory_max_tokens=self.memory_max_tokens,
+                semantic_cache=self.semantic_cache,
             )
             logger.info("Successfully created agent")
             return agent
         except Exception as e:
             logger.error(f"Failed to create agent: {str(e)}", exc_info=True)
             raise
+
+    def _get_batch_agent(self) -> AgentExecutor:
+        """Get the agent used for batches, created on first use.
+
+        Batch inputs are independent questions, so this agent keeps no memory.
+        """
+        if self._batch_agent is None:
+            llm = create_llm(model=self.model, provider=self.provider)
+            self._batch_agent = create_agent(
+                tools=self.tool_list,
+                llm=llm,
+                use_memory=False,
+                semantic_cache=self.semantic_cache,
+            )
+        return self._batch_agent
+
+    def run_batch(
+        self,
+        prompts: List[Dict[str, Any]],
+        max_concurrency: int = 4,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Run the agent on several independent inputs concurrently.
+
+        Args:
+            prompts: agent inputs, e.g. [{"input": "..."}].
+            max_concurrency: maximum number of inputs processed at the same time.
+            return_exceptions: whether to return the exception of a failed input
+                instead of raising it.
+
+        Returns:
+            the agent outputs, in the order of the inputs.
+        """
+        return self._get_batch_agent().batch(
+            prompts,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=return_exceptions,
+        )
+
+    async def arun_batch(
+        self,
+        prompts: List[Dict[str, Any]],
+        max_concurrency: int = 4,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Run the agent on several independent inputs concurrently, asynchronously.
+
+        Args:
+            prompts: agent inputs, e.g. [{"input": "..."}].
+            max_concurrency: maximum number of inputs processed at the same time.
+            return_exceptions: whether to return the exception of a failed input
+                instead of raising it.
+
+        Returns:
+            the agent outputs, in the order of the inputs.
+        """
+        return await self._get_batch_agent().abatch(
+            prompts,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=return_exceptions,
+        )
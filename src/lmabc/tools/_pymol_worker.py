@@ -0,0 +1,96 @@
+"""PyMOL worker process applying point mutations, driven over its standard input and output."""
+
+__copyright__ = """
+MIT License
+
+Copyright (c) 2024 GT4SD team
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import os
+import sys
+from typing import Any, List
+
+
+def apply_mutations(
+    cmd: Any, pdb_file: str, positions: List[int], residues: List[str], output_file: str
+) -> None:
+    """
+    Apply point mutations to a structure with the PyMOL mutagenesis wizard.
+
+    Args:
+        cmd: The pymol.cmd module.
+        pdb_file: Path to the input PDB file.
+        positions: Residue numbers to mutate.
+        residues: Three-letter codes of the new residues.
+        output_file: Path to save the mutated structure.
+    """
+    cmd.load(pdb_file, "protein")
+    cmd.wizard("mutagenesis")
+    cmd.do("refresh_wizard")
+
+    # Only the saved structure matters, so skip undo and movie bookkeeping.
+    cmd.set("suspend_undo", 1)
+    cmd.set("movie_auto_store", 0)
+    cmd.feedback("disable", "all", "actions")
+
+    try:
+        for position, residue in zip(positions, residues):
+            wizard = cmd.get_wizard()
+            wizard.set_mode(residue)
+            wizard.do_select(f"{position}/")
+            # The rotamer frame is selected for each residue, after the selection
+            # has loaded its rotamers.
+            cmd.frame(1)
+            wizard.apply()
+
+        cmd.set("suspend_undo", 0)
+        cmd.save(output_file)
+    finally:
+        cmd.set_wizard()
+        cmd.delete("all")
+
+
+def main() -> None:
+    """
+    Serve mutation jobs, one JSON object per line, until standard input is closed.
+
+    Each job gets one JSON line in reply, whose error field is null on success.
+    Standard output is reserved for the replies, PyMOL's own output goes to
+    standard error.
+    """
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    from pymol import cmd
+
+    for line in sys.stdin:
+        try:
+            apply_mutations(cmd, **json.loads(line))
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        replies.write(json.dumps({"error": error}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,13 +24,24 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import atexit
+import json
 import logging
+import mmap
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
-from Bio.PDB import PDBParser, Superimposer
-from Bio.SeqUtils import seq1
-from pydantic import BaseModel
+import numpy as np
+import scipy.linalg
+from Bio.Data.IUPACData import protein_letters_3to1_extended
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from ..configuration import BIOCATALYSIS_AGENT_CONFIGURATION
@@ -44,17 +55,292 @@ logger.addHandler(logging.NullHandler())
 class MutagenesisConfiguration(BaseSettings):
     """Configuration values for the Mutagenesis tool."""
 
-    output_dir: Path = BIOCATALYSIS_AGENT_CONFIGURATION.get_tools_cache_path(
-        "mutagenesis"
+    output_dir: Path = Field(
+        default_factory=lambda: BIOCATALYSIS_AGENT_CONFIGURATION.get_tools_cache_path(
+            "mutagenesis"
+        ),
+        description="Root directory for mutagenesis outputs.",
+    )
+    clean_pdb_dir: Path = Field(
+        default_factory=lambda: BIOCATALYSIS_AGENT_CONFIGURATION.get_tools_cache_path(
+            "mutagenesis"
+        )
+        / "clean_pdb",
+        description="Directory for cleaned PDB files.",
+    )
+    mutated_pdb_dir: Path = Field(
+        default_factory=lambda: BIOCATALYSIS_AGENT_CONFIGURATION.get_tools_cache_path(
+            "mutagenesis"
+        )
+        / "mutated_pdb",
+        description="Directory for mutated PDB files.",
     )
-    clean_pdb_dir: Path = output_dir / "clean_pdb"
-    mutated_pdb_dir: Path = output_dir / "mutated_pdb"
     pymol_path: str = "pymol"
     alignment_threshold: float = 0.5
-    model_config = SettingsConfigDict(env_prefix="MUTAGENESIS_")
+    model_config = SettingsConfigDict(env_prefix="MUTAGENESIS_", frozen=True)
+
+
+@cache
+def _settings() -> MutagenesisConfiguration:
+    """
+    Get the Mutagenesis configuration, built on first use.
+
+    Returns:
+        The shared Mutagenesis configuration.
+    """
+    return MutagenesisConfiguration()
+
+
+_ONE_TO_THREE: Dict[str, str] = {
+    "A": "ALA",
+    "C": "CYS",
+    "D": "ASP",
+    "E": "GLU",
+    "F": "PHE",
+    "G": "GLY",
+    "H": "HIS",
+    "I": "ILE",
+    "K": "LYS",
+    "L": "LEU",
+    "M": "MET",
+    "N": "ASN",
+    "P": "PRO",
+    "Q": "GLN",
+    "R": "ARG",
+    "S": "SER",
+    "T": "THR",
+    "V": "VAL",
+    "W": "TRP",
+    "Y": "TYR",
+}
+
+# Three-letter codes indexed by the low five bits of a one-letter ASCII code.
+_AA_TABLE: Tuple[str, ...] = tuple(
+    _ONE_TO_THREE.get(chr(ord("@") + i), "UNK") for i in range(32)
+)
+
+# Byte values of the standard one-letter amino acid codes.
+_VALID_AA_CODES = np.frombuffer(b"ACDEFGHIKLMNPQRSTVWY", dtype=np.uint8)
+
+# Serializes access to the shared PyMOL session.
+_PYMOL_LOCK = threading.Lock()
+
+
+class _PyMOLWorker:
+    """
+    PyMOL worker process owned by this process.
+
+    Keeping the PyMOL session warm avoids paying its start-up cost for every
+    mutagenesis job. The worker is driven over its standard input and output,
+    so that no other process can send it commands. Callers must hold _PYMOL_LOCK.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the holder, the worker is started on first use."""
+        self._process: Optional[subprocess.Popen] = None
+
+    def run(self, **job: Any) -> None:
+        """
+        Send a job to the worker, starting it if it is not running, and wait for it.
+
+        Args:
+            **job: The arguments of _pymol_worker.apply_mutations.
+
+        Raises:
+            ConnectionError: If the worker exited before replying.
+            RuntimeError: If PyMOL failed to apply the mutations.
+        """
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "lmabc.tools._pymol_worker"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        stdin, stdout = self._process.stdin, self._process.stdout
+        if stdin is None or stdout is None:
+            raise ConnectionError("The PyMOL worker has no pipes.")
+        try:
+            stdin.write(json.dumps(job) + "\n")
+            stdin.flush()
+        except BrokenPipeError as e:
+            raise ConnectionError("The PyMOL worker exited.") from e
+        reply = stdout.readline()
+        if not reply:
+            raise ConnectionError("The PyMOL worker exited.")
+        error = json.loads(reply)["error"]
+        if error is not None:
+            raise RuntimeError(f"PyMOL failed to apply the mutations: {error}")
+
+    def reset(self) -> None:
+        """Stop the worker, the next job starts a new one."""
+        if self._process is not None:
+            self._process.terminate()
+        self._process = None
+
+
+_PYMOL_WORKER = _PyMOLWorker()
+atexit.register(_PYMOL_WORKER.reset)
+
+
+class _ThreeToOneTable(dict):
+    """Three-letter to one-letter residue table with seq1-compatible fallbacks."""
+
+    def __missing__(self, key: str) -> str:
+        """Map unknown residues to 'X' and names shorter than three letters to ''."""
+        return "X" if len(key) >= 3 else ""
+
+
+_THREE_TO_ONE = _ThreeToOneTable(
+    {key.upper(): value for key, value in protein_letters_3to1_extended.items()},
+    TER="*",
+)
+
+# CA atom records (standard and hetero residues, first alternate location only).
+_CA_RECORD = re.compile(rb"^(?:ATOM  |HETATM).{6} CA [ A]", re.MULTILINE)
+
+# SEQRES records (chain identifier and residue names) or CA atom records.
+_PDB_RECORD = re.compile(
+    rb"^(?:SEQRES.{5}(?P<chain>.).{7}(?P<residues>[^\n]*)"
+    rb"|(?:ATOM  |HETATM).{6} CA [ A])",
+    re.MULTILINE,
+)
+
+
+def _ca_coordinates(buffer: mmap.mmap, starts: List[int]) -> np.ndarray:
+    """
+    Read the coordinates of the CA atom records starting at the given offsets.
+
+    Args:
+        buffer: The mapped PDB file.
+        starts: Offsets of the CA atom records in the buffer.
+
+    Returns:
+        A read-only array of shape (n_atoms, 3) with the CA coordinates.
+    """
+    coordinates = np.empty((len(starts), 3), dtype=np.float64)
+    for i, start in enumerate(starts):
+        coordinates[i] = (
+            float(buffer[start + 30 : start + 38]),
+            float(buffer[start + 38 : start + 46]),
+            float(buffer[start + 46 : start + 54]),
+        )
+    coordinates.flags.writeable = False
+    return coordinates
+
+
+@lru_cache(maxsize=128)
+def _read_ca_coordinates(path: str, mtime_ns: int, size: int) -> np.ndarray:  # noqa: ARG001
+    """
+    Read the CA atom coordinates of a PDB file, memoized per file version.
+
+    Args:
+        path: Path to the PDB file.
+        mtime_ns: Modification time of the file in nanoseconds, used only as part
+            of the cache key so that rewritten files are read again.
+        size: Size of the file in bytes, also part of the cache key, so that a file
+            rewritten within the timestamp resolution is read again too.
+
+    Returns:
+        A read-only array of shape (n_atoms, 3) with the CA coordinates.
+    """
+    with Path(path).open("rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        return _ca_coordinates(mm, [match.start() for match in _CA_RECORD.finditer(mm)])
+
+
+def _load_ca_coordinates(path: Union[str, Path]) -> np.ndarray:
+    """
+    Read the CA atom coordinates of the current version of a PDB file.
+
+    Args:
+        path: Path to the PDB file.
+
+    Returns:
+        A read-only array of shape (n_atoms, 3) with the CA coordinates.
+    """
+    stat_result = Path(path).stat()
+    return _read_ca_coordinates(str(path), stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _residue_names(path: Path) -> Dict[str, Set[str]]:
+    """
+    Read the residue names of the CA atoms of a PDB file.
+
+    Args:
+        path: Path to the PDB file.
+
+    Returns:
+        The residue names found at each residue number, over all chains.
+    """
+    names: Dict[str, Set[str]] = {}
+    with path.open() as f:
+        for line in f:
+            if line.startswith(("ATOM  ", "HETATM")) and line[12:16] == " CA ":
+                names.setdefault(line[22:26].strip(), set()).add(line[17:20])
+    return names
+
+
+def _kabsch_rmsd(reference: np.ndarray, moving: np.ndarray) -> float:
+    """
+    Compute the RMSD between two coordinate sets after optimal superposition.
+
+    Args:
+        reference: Array of shape (n_atoms, 3) with the fixed coordinates.
+        moving: Array of shape (n_atoms, 3) with the coordinates to superimpose.
+
+    Returns:
+        The RMSD after superimposing moving onto reference.
+    """
+    reference_centered = reference - reference.mean(axis=0)
+    moving_centered = moving - moving.mean(axis=0)
 
+    covariance = moving_centered.T @ reference_centered
+    u, _, vt = scipy.linalg.svd(
+        covariance, check_finite=False, lapack_driver="gesdd"
+    )
+    # Correct for reflections so that the result is a proper rotation.
+    d = np.sign(np.linalg.det(vt.T @ u.T))
+    rotation = vt.T @ np.diag([1.0, 1.0, d]) @ u.T
+
+    difference = moving_centered @ rotation.T - reference_centered
+    return float(np.sqrt((difference * difference).sum() / len(reference)))
+
+
+@dataclass(frozen=True)
+class MutationSet:
+    """
+    Point mutations stored as parallel arrays.
+
+    Attributes:
+        original: ASCII codes of the original residues.
+        positions: 1-based residue positions.
+        target: ASCII codes of the new residues.
+    """
 
-MUTAGENESIS_SETTINGS = MutagenesisConfiguration()
+    original: np.ndarray
+    positions: np.ndarray
+    target: np.ndarray
+
+    def __len__(self) -> int:
+        """Number of mutations."""
+        return len(self.positions)
+
+    def get_mutations_str(self) -> List[str]:
+        """
+        Format the mutations for display.
+
+        Returns:
+            A list of mutation strings in the format 'OriginalAA{position}NewAA'.
+        """
+        return [
+            f"{chr(original)}{position}{chr(target)}"
+            for original, position, target in zip(
+                self.original.tolist(), self.positions.tolist(), self.target.tolist()
+            )
+        ]
 
 
 class MutationInput(BaseModel):
@@ -105,11 +391,12 @@ class Mutagenesis(BiocatalysisAssistantBaseTool):
     @staticmethod
     def check_requirements() -> bool:
         """
-        Check if the required directories and files for Mutagenesis exist.
+        Check if the required directories, files and PyMOL for Mutagenesis exist.
         Returns:
-            True if all required directories and files exist, False otherwise.
+            True if all required directories and files exist and PyMOL is available,
+            False otherwise.
         """
-        settings = MUTAGENESIS_SETTINGS
+        settings = _settings()
 
         paths_to_check = [
             settings.output_dir,
@@ -129,13 +416,11 @@ class Mutagenesis(BiocatalysisAssistantBaseTool):
                         logger.info(
                             f"Directory {path} was missing and has been created."
                         )
-                        return True
                     except Exception as e:
                         logger.error(f"Failed to create directory {path}. Error: {e}")
                         return False
             else:
                 logger.info(f"{path} already exists.")
-                return True
 
         try:
             from pymol import cmd
@@ -165,38 +450,84 @@ class Mutagenesis(BiocatalysisAssistantBaseTool):
         return local_path
 
     @staticmethod
-    def extract_full_sequence(pdb_file: Path) -> Tuple[str, str]:
+    def _load_pdb(pdb_file: Path) -> Tuple[str, str, np.ndarray]:
         """
-        Extract the full amino acid sequence from a PDB file's SEQRES records.
+        Read the sequence and CA coordinates of a PDB file in a single pass.
 
         Args:
             pdb_file: Path to the PDB file.
 
         Returns:
-            A tuple containing the chain ID and the full amino acid sequence.
+            A tuple containing the chain ID, the full amino acid sequence of that
+            chain from the SEQRES records, and the CA atom coordinates.
 
         Raises:
             ValueError: If no SEQRES records are found in the PDB file.
         """
-        with Path.open(pdb_file, "r") as f:
-            lines = f.readlines()
+        chain_id: Optional[bytes] = None
+        residues: List[str] = []
+        ca_starts: List[int] = []
+
+        with Path.open(pdb_file, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            for match in _PDB_RECORD.finditer(mm):
+                chain = match.group("chain")
+                if chain is None:
+                    ca_starts.append(match.start())
+                elif chain_id is None or chain == chain_id:
+                    chain_id = chain
+                    residues.extend(
+                        match.group("residues").decode("ascii", errors="replace").split()
+                    )
+            coordinates = _ca_coordinates(mm, ca_starts)
+
+        if chain_id is None:
+            raise ValueError("No SEQRES records found in the PDB file.")
 
-        seqres_lines = [line for line in lines if line.startswith("SEQRES")]
+        sequence = "".join(map(_THREE_TO_ONE.__getitem__, residues))
 
-        if not seqres_lines:
-            raise ValueError("No SEQRES records found in the PDB file.")
+        return chain_id.decode("ascii", errors="replace"), sequence, coordinates
 
-        chain_id = seqres_lines[0][11]
-        sequence = ""
+    @staticmethod
+    def extract_full_sequence(pdb_file: Path) -> Tuple[str, str]:
+        """
+        Extract the full amino acid sequence from a PDB file's SEQRES records.
 
-        for line in seqres_lines:
-            if line[11] == chain_id:
-                sequence += "".join(seq1(res) for res in line[19:].split())
+        Args:
+            pdb_file: Path to the PDB file.
 
+        Returns:
+            A tuple containing the chain ID and the full amino acid sequence.
+
+        Raises:
+            ValueError: If no SEQRES records are found in the PDB file.
+        """
+        chain_id, sequence, _ = Mutagenesis._load_pdb(pdb_file)
         return chain_id, sequence
 
     @staticmethod
-    def find_mutations(original_sequence: str, target_sequence: str) -> List[str]:
+    def validate_sequence(sequence: str) -> None:
+        """
+        Check that a sequence only contains standard one-letter amino acid codes.
+
+        Args:
+            sequence: The amino acid sequence to validate.
+
+        Raises:
+            ValueError: If the sequence contains invalid characters.
+        """
+        codes = np.frombuffer(sequence.encode("ascii", errors="replace"), dtype=np.uint8)
+        valid_mask = np.isin(codes, _VALID_AA_CODES)
+        if not valid_mask.all():
+            invalid_positions = np.nonzero(~valid_mask)[0] + 1
+            raise ValueError(
+                "Target sequence contains invalid amino acid codes at positions: "
+                f"{', '.join(map(str, invalid_positions.tolist()))}"
+            )
+
+    @staticmethod
+    def find_mutations(original_sequence: str, target_sequence: str) -> MutationSet:
         """
         Identify mutations needed to transform the original sequence into the target sequence.
 
@@ -205,15 +536,21 @@ class Mutagenesis(BiocatalysisAssistantBaseTool):
             target_sequence: The target amino acid sequence.
 
         Returns:
-            A list of mutation strings in the format 'OriginalAA{position}NewAA'.
+            The mutations, compared over the length of the shorter sequence.
         """
-        mutations = []
-        for i, (orig, target) in enumerate(
-            zip(original_sequence, target_sequence), start=1
-        ):
-            if orig != target:
-                mutations.append(f"{orig}{i}{target}")
-        return mutations
+        length = min(len(original_sequence), len(target_sequence))
+        original = np.frombuffer(
+            original_sequence[:length].encode("ascii", errors="replace"), dtype=np.uint8
+        )
+        target = np.frombuffer(
+            target_sequence[:length].encode("ascii", errors="replace"), dtype=np.uint8
+        )
+        indices = np.nonzero(original != target)[0]
+        return MutationSet(
+            original=original[indices],
+            positions=(indices + 1).astype(np.int32),
+            target=target[indices],
+        )
 
     @staticmethod
     def one_to_three(one_letter_code: str) -> str:
@@ -226,73 +563,75 @@ class Mutagenesis(BiocatalysisAssistantBaseTool):
         Returns:
             The three-letter code for the amino acid, or 'UNK' if not recognized.
         """
-        aa_dict: Dict[str, str] = {
-            "A": "ALA",
-            "C": "CYS",
-            "D": "ASP",
-            "E": "GLU",
-            "F": "PHE",
-            "G": "GLY",
-            "H": "HIS",
-            "I": "ILE",
-            "K": "LYS",
-            "L": "LEU",
-            "M": "MET",
-            "N": "ASN",
-            "P": "PRO",
-            "Q": "GLN",
-            "R": "ARG",
-            "S": "SER",
-            "T": "THR",
-            "V": "VAL",
-            "W": "TRP",
-            "Y": "TYR",
-        }
-        return aa_dict.get(one_letter_code.upper(), "UNK")
+        return _ONE_TO_THREE.get(one_letter_code.upper(), "UNK")
 
     @staticmethod
     def perform_mutations(
-        pdb_file: Path, mutations: List[str], output_file: Path
+        pdb_file: Path, mutations: MutationSet, output_file: Path
     ) -> None:
         """
         Apply specified mutations to a protein structure using PyMOL.
 
+        The mutations are applied by a long-lived PyMOL worker process, see
+        _PyMOLWorker. A worker that exited is restarted and the mutations are
+        retried once, a worker that reported an error is restarted before the
+        next job.
+
         Args:
             pdb_file: Path to the input PDB file.
             mutations: List of mutations to perform.
             output_file: Path to save the mutated structure.
 
         Raises:
-            PyMOLError: If there's an error in PyMOL during mutation.
+            RuntimeError: If there's an error in PyMOL during mutation, or if the
+                saved structure does not carry the new residues.
         """
-        from pymol import cmd
-
-        cmd.load(str(pdb_file), "protein")
-        cmd.wizard("mutagenesis")
-        cmd.do("refresh_wizard")
-
-        for mutation in mutations:
-            _, pos, new = mutation[0], mutation[1:-1], mutation[-1]
-            new_res = Mutagenesis.one_to_three(new)
-
-            cmd.get_wizard().set_mode(new_res)
-            cmd.get_wizard().do_select(f"{pos}/")
-
-            cmd.frame(1)
-
-            cmd.get_wizard().apply()
-
-        cmd.save(str(output_file))
-        cmd.delete("all")
+        job: Dict[str, Any] = {
+            "pdb_file": str(pdb_file),
+            "positions": mutations.positions.tolist(),
+            "residues": [_AA_TABLE[new & 0x1F] for new in mutations.target.tolist()],
+            "output_file": str(output_file),
+        }
+        # The saved file is checked below, never check a file left by a previous run.
+        output_file.unlink(missing_ok=True)
+        with _PYMOL_LOCK:
+            try:
+                _PYMOL_WORKER.run(**job)
+            except ConnectionError as e:
+                logger.warning(f"Lost the PyMOL worker, restarting it: {e}")
+                _PYMOL_WORKER.reset()
+                _PYMOL_WORKER.run(**job)
+            except RuntimeError:
+                _PYMOL_WORKER.reset()
+                raise
+
+        # Some wizard failures are only logged by PyMOL, check the saved residues.
+        if not output_file.exists():
+            raise RuntimeError("PyMOL did not save the mutated structure.")
+        names = _residue_names(output_file)
+        missing = [
+            f"{residue}{position}"
+            for position, residue in zip(job["positions"], job["residues"])
+            if residue not in names.get(str(position), ())
+        ]
+        if missing:
+            raise RuntimeError(
+                f"PyMOL did not apply the mutations: {', '.join(missing)}"
+            )
 
     @staticmethod
-    def calculate_rmsd(structure_1: Path, structure_2: Path) -> float:
+    def calculate_rmsd(
+        structure_1: Path,
+        structure_2: Path,
+        coordinates_1: Optional[np.ndarray] = None,
+    ) -> float:
         """
         Calculate the RMSD between two protein structures using CA atoms.
 
         Args:
             structure_1: Path to the first PDB structure file.
             structure_2: Path to the second PDB structure file.
+            coordinates_1: CA coordinates of the first structure, if already loaded.
 
         Returns:
             The calculated RMSD value as a float.
@@ -300,30 +639,16 @@ class Mutagenesis(BiocatalysisAssistantBaseTool):
         Raises:
             ValueError: If the structures cannot be aligned or compared.
         """
-        parser = PDBParser(QUIET=True)
-        structure1 = parser.get_structure("structure1", structure_1)
-        structure2 = parser.get_structure("structure2", structure_2)
-
-        def get_ca_atoms(structure):
-            atoms = []
-            for model in structure:
-                for chain in model:
-                    for residue in chain:
-                        if residue.has_id("CA"):
-                            atoms.append(residue["CA"])
-            return atoms
-
-        atoms1 = get_ca_atoms(structure1)
-        atoms2 = get_ca_atoms(structure2)
+        coordinates1 = (
+            coordinates_1
+            if coordinates_1 is not None
+            else _load_ca_coordinates(structure_1)
+        )
+        coordinates2 = _load_ca_coordinates(structure_2)
 
-        n_atoms = min(len(atoms1), len(atoms2))
-        atoms1 = atoms1[:n_atoms]
-        atoms2 = atoms2[:n_atoms]
+        n_atoms = min(len(coordinates1), len(coordinates2))
 
-        sup = Superimposer()
-        sup.set_atoms(atoms1, atoms2)
-
-        return cast(float, sup.rms)
+        return _kabsch_rmsd(coordinates1[:n_atoms], coordinates2[:n_atoms])
 
     def _run(
         self, pdb_code: str, target_sequence: str, perform_rmsd: bool = False
@@ -344,18 +669,31 @@ class Mutagenesis(BiocatalysisAssistantBaseTool):
             ValueError: If the mutagenesis process fails at any step.
         """
         try:
+            self.validate_sequence(target_sequence)
             pdb_file = self.get_pdb_file(pdb_code)
-            _, original_sequence = self.extract_full_sequence(pdb_file)
+            _, original_sequence, ca_coordinates = self._load_pdb(pdb_file)
             mutations = self.find_mutations(original_sequence, target_sequence)
 
             output_file = pdb_file.parent / f"{pdb_code}_mutated.pdb"
+
+            if not mutations:
+                # Nothing to mutate: skip the PyMOL round trip entirely.
+                shutil.copyfile(pdb_file, output_file)
+                result = "No mutations needed, the structure already matches the target sequence. "
+                result += f"Structure saved to: {output_file}. "
+                if perform_rmsd:
+                    result += "RMSD between original and mutated structure: 0.0000 Å"
+                return result
+
             self.perform_mutations(pdb_file, mutations, output_file)
 
-            result = f"Mutations performed: {', '.join(mutations)}. "
+            result = f"Mutations performed: {', '.join(mutations.get_mutations_str())}. "
             result += f"Mutated structure saved to: {output_file}. "
 
             if perform_rmsd:
-                rmsd = self.calculate_rmsd(pdb_file, output_file)
+                rmsd = self.calculate_rmsd(
+                    pdb_file, output_file, coordinates_1=ca_coordinates
+                )
                 result += f"RMSD between original and mutated structure: {rmsd:.4f} Å"
 
             return result
@@ -25,32 +25,286 @@ SOFTWARE.
 """
 
 
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from functools import lru_cache
 from pathlib import Path
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import anyio
 import requests
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from rcsbsearchapi.search import SequenceQuery
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ..configuration import BIOCATALYSIS_AGENT_CONFIGURATION
 from .core import BiocatalysisAssistantBaseTool
 
+if TYPE_CHECKING:
+    import aiohttp
+else:
+    try:
+        import aiohttp
+    except ImportError:  # pragma: no cover
+        aiohttp = None
+
+_json_loads: Callable[[Union[str, bytes]], Any]
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
 
 class PDBConfiguration(BaseSettings):
-    """Configuration values for the PDB tool."""
+    """Configuration values for the PDB tool.
+
+    Attributes:
+        output_dir: Directory where downloaded PDB files are saved.
+        cache_dir: Directory for cached RCSB search and metadata responses.
+        evalue_cutoff: E-value cutoff for the sequence search.
+        identity_cutoff: Identity cutoff for the sequence search.
+        sequence_query_cache_ttl: Lifetime in seconds of cached sequence search results,
+            so that new depositions are eventually found.
+        disable_prewarm: Skip opening the RCSB connections in the background at import.
+    """
 
     output_dir: str = str(BIOCATALYSIS_AGENT_CONFIGURATION.get_tools_cache_path("pdb"))
+    cache_dir: str = str(
+        BIOCATALYSIS_AGENT_CONFIGURATION.get_tools_cache_path("pdb") / "cache"
+    )
     evalue_cutoff: int = 1
     identity_cutoff: float = 1
+    sequence_query_cache_ttl: float = 7 * 24 * 3600
+    disable_prewarm: bool = False
 
     model_config = SettingsConfigDict(env_prefix="PDB_")
 
 
 PDB_SETTINGS = PDBConfiguration()
 
+# Transient RCSB failures are retried with exponential backoff, in both the
+# requests session and the aiohttp path.
+_RETRIES = 3
+_BACKOFF = 0.3
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Shared HTTP session, keeps connections to the RCSB hosts alive across calls.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        pool_block=False,
+        max_retries=Retry(
+            total=_RETRIES, backoff_factor=_BACKOFF, status_forcelist=sorted(_RETRY_STATUSES)
+        ),
+    ),
+)
+_TIMEOUT = (5, 30)
+
+
+def _request_metadata(method: str, url: str, **kwargs: Any) -> Any:
+    """
+    Send a request to the RCSB metadata API and decode the JSON response.
+
+    Args:
+        method: The HTTP method.
+        url: The request URL.
+        **kwargs: Additional request arguments, e.g. json.
+
+    Returns:
+        The decoded JSON response.
+
+    Raises:
+        Exception: If the request fails or returns an error status.
+    """
+    response = _SESSION.request(
+        method,
+        url,
+        headers={"Accept": "application/json"},
+        timeout=_TIMEOUT,
+        **kwargs,
+    )
+    response.raise_for_status()
+    return _json_loads(response.content)
+
+
+def _prewarm() -> None:
+    """Open the connections to the RCSB hosts, so the first tool call skips DNS and TLS setup."""
+    for url in ("https://data.rcsb.org/", "https://files.rcsb.org/"):
+        try:
+            _SESSION.head(url, timeout=5)
+        except Exception as e:
+            logger.debug(f"Failed to prewarm connection to {url}: {e}")
+
+
+if not PDB_SETTINGS.disable_prewarm:
+    threading.Thread(target=_prewarm, name="rcsb-prewarm", daemon=True).start()
+
+
+POLYMER_ENTITY_URL = "https://data.rcsb.org/rest/v1/core/polymer_entity/{entry_id}/{entity_id}"
+GRAPHQL_URL = "https://data.rcsb.org/graphql"
+SEQUENCE_LENGTHS_QUERY = """
+query ($ids: [String!]!) {
+  polymer_entities(entity_ids: $ids) {
+    rcsb_id
+    entity_poly { rcsb_sample_sequence_length }
+  }
+}
+"""
+
+
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    """
+    Write a JSON cache file atomically, so that readers never see a partial file.
+
+    Failing to write, e.g. to a read-only or full cache directory, only logs a
+    warning, so that the cache never fails a lookup.
+
+    Args:
+        path: Destination path.
+        payload: JSON-serializable content.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(payload))
+            Path(tmp_name).replace(path)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not write cache file {path}: {e}")
+
+
+def _polymer_entity_cache_path(entry_id: str, entity_id: str) -> Path:
+    """
+    Get the on-disk cache path of a polymer entity.
+
+    Args:
+        entry_id: The PDB entry identifier.
+        entity_id: The entity identifier within the entry.
+
+    Returns:
+        Path of the cached polymer entity JSON file.
+    """
+    return Path(PDB_SETTINGS.cache_dir) / "polymer_entity" / f"{entry_id}_{entity_id}.json"
+
+
+def _read_cached_sequence(entry_id: str, entity_id: str) -> Optional[str]:
+    """
+    Read the canonical sequence of a polymer entity from the on-disk cache.
+
+    Args:
+        entry_id: The PDB entry identifier.
+        entity_id: The entity identifier within the entry.
+
+    Returns:
+        The cached sequence, or None on a cache miss.
+    """
+    path = _polymer_entity_cache_path(entry_id, entity_id)
+    if not path.exists():
+        return None
+    return _json_loads(path.read_bytes())["pdbx_seq_one_letter_code_can"]
+
+
+def _write_cached_sequence(entry_id: str, entity_id: str, sequence: str) -> None:
+    """
+    Store the canonical sequence of a polymer entity in the on-disk cache.
+
+    Args:
+        entry_id: The PDB entry identifier.
+        entity_id: The entity identifier within the entry.
+        sequence: The canonical one-letter sequence.
+    """
+    _write_json_atomic(
+        _polymer_entity_cache_path(entry_id, entity_id),
+        {"pdbx_seq_one_letter_code_can": sequence},
+    )
+
+
+@lru_cache(maxsize=4096)
+def _fetch_polymer_entity(entry_id: str, entity_id: str) -> str:
+    """
+    Get the canonical sequence of a polymer entity, from the caches or from RCSB.
+
+    Args:
+        entry_id: The PDB entry identifier.
+        entity_id: The entity identifier within the entry.
+
+    Returns:
+        The canonical one-letter sequence.
+
+    Raises:
+        Exception: If the polymer entity could not be fetched.
+    """
+    sequence = _read_cached_sequence(entry_id, entity_id)
+    if sequence is None:
+        url = POLYMER_ENTITY_URL.format(entry_id=entry_id, entity_id=entity_id)
+        data = _request_metadata("GET", url)
+        sequence = data["entity_poly"]["pdbx_seq_one_letter_code_can"]
+        _write_cached_sequence(entry_id, entity_id, sequence)
+    return sequence
+
+
+def _is_same_sequence(sequence: Optional[str], protein_sequence: str) -> bool:
+    """
+    Check whether a fetched sequence matches the query exactly.
+
+    The length gate rejects most candidates before any character comparison.
+
+    Args:
+        sequence: The fetched canonical sequence, or None if unavailable.
+        protein_sequence: The query protein sequence.
+
+    Returns:
+        True if both sequences are identical, False otherwise.
+    """
+    return (
+        sequence is not None
+        and len(sequence) == len(protein_sequence)
+        and sequence == protein_sequence
+    )
+
+
+def _has_running_loop() -> bool:
+    """
+    Check whether an asyncio event loop is running in the current thread.
+
+    Returns:
+        True if called from within a running event loop, False otherwise.
+    """
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
 
 class FindPDBStructure(BiocatalysisAssistantBaseTool):
     """Tool for finding the PDB structure of a protein sequence."""
@@ -66,37 +320,259 @@ class FindPDBStructure(BiocatalysisAssistantBaseTool):
         """Initialize the FindPDBStructure tool"""
         super().__init__(**kwargs)
 
-    def _run(self, protein_sequence: str) -> str:
-        """Run FindPDBStructure."""
+    @staticmethod
+    def _query(protein_sequence: str) -> List[str]:
+        """
+        Search RCSB for polymer entities related to a protein sequence.
+
+        Non-empty results are cached on disk for identical queries, for
+        sequence_query_cache_ttl seconds. Repeated hits are dropped, keeping the
+        order in which RCSB ranked them.
+
+        Args:
+            protein_sequence: The protein sequence to search for.
+
+        Returns:
+            Candidate polymer entity identifiers in the form 'ENTRY_ENTITY'.
+        """
+        query = (
+            protein_sequence,
+            PDB_SETTINGS.evalue_cutoff,
+            PDB_SETTINGS.identity_cutoff,
+        )
+        query_key = hashlib.sha256(json.dumps(query).encode()).hexdigest()
+        cache_path = Path(PDB_SETTINGS.cache_dir) / "sequence_query" / f"{query_key}.json"
         try:
+            if time.time() - cache_path.stat().st_mtime < PDB_SETTINGS.sequence_query_cache_ttl:
+                return list(dict.fromkeys(_json_loads(cache_path.read_bytes())))
+        except OSError:
+            pass
+
+        results = SequenceQuery(
+            protein_sequence,
+            PDB_SETTINGS.evalue_cutoff,
+            PDB_SETTINGS.identity_cutoff,
+        )
+        pdb_ids = list(dict.fromkeys(results("polymer_entity")))
+        if pdb_ids:
+            _write_json_atomic(cache_path, pdb_ids)
+        return pdb_ids
+
+    @staticmethod
+    def _fetch_sequence_lengths(pdb_ids: List[str]) -> Dict[str, int]:
+        """
+        Fetch the sequence lengths of several polymer entities in a single request.
+
+        Args:
+            pdb_ids: Polymer entity identifiers in the form 'ENTRY_ENTITY'.
 
-            # Query
-            results = SequenceQuery(
-                protein_sequence,
-                PDB_SETTINGS.evalue_cutoff,
-                PDB_SETTINGS.identity_cutoff,
+        Returns:
+            Sequence length by polymer entity identifier. Entities whose length
+            could not be fetched are missing.
+        """
+        if not pdb_ids:
+            return {}
+        try:
+            data = _request_metadata(
+                "POST",
+                GRAPHQL_URL,
+                json={"query": SEQUENCE_LENGTHS_QUERY, "variables": {"ids": pdb_ids}},
             )
-            pdb_ids = [polyid for polyid in results("polymer_entity")]
+            entities = data["data"]["polymer_entities"] or []
+            return {
+                entity["rcsb_id"]: entity["entity_poly"]["rcsb_sample_sequence_length"]
+                for entity in entities
+                if entity and entity.get("entity_poly")
+            }
+        except Exception as e:
+            logger.warning(f"Could not fetch sequence lengths, not filtering: {e}")
+            return {}
 
-            # Search
-            for tmp_pdb in pdb_ids:
-                entry_id, entity_id = tmp_pdb.split("_")
-                url = f"https://data.rcsb.org/rest/v1/core/polymer_entity/{entry_id}/{entity_id}"
-                try:
-                    response = requests.get(url)
-                    if response.status_code == 200:
-                        data = response.json()
-                        tmp_target_sequence = data["entity_poly"][
-                            "pdbx_seq_one_letter_code_can"
-                        ]
-                        if tmp_target_sequence == protein_sequence:
-                            return f"pdb code {entry_id} with entity id {entity_id}"
-                    else:
+    def _candidates(self, protein_sequence: str) -> List[str]:
+        """
+        Get the candidates that may match a protein sequence exactly.
+
+        Candidates whose sequence length differs from the query are dropped
+        before any per-entity request is made.
+
+        Args:
+            protein_sequence: The protein sequence to search for.
+
+        Returns:
+            Candidate polymer entity identifiers in the form 'ENTRY_ENTITY'.
+        """
+        pdb_ids = self._query(protein_sequence)
+        lengths = self._fetch_sequence_lengths(pdb_ids)
+        target_length = len(protein_sequence)
+        return [
+            pdb_id
+            for pdb_id in pdb_ids
+            if lengths.get(pdb_id, target_length) == target_length
+        ]
+
+    @staticmethod
+    def _fetch_sequence(entry_id: str, entity_id: str) -> Optional[str]:
+        """
+        Fetch the canonical sequence of a polymer entity.
+
+        Args:
+            entry_id: The PDB entry identifier.
+            entity_id: The entity identifier within the entry.
+
+        Returns:
+            The canonical one-letter sequence, or None if the entity does not exist.
+
+        Raises:
+            Exception: If the entity could not be fetched, even after retries.
+        """
+        try:
+            return _fetch_polymer_entity(entry_id, entity_id)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    @staticmethod
+    async def _fetch(
+        session: "aiohttp.ClientSession", entry_id: str, entity_id: str
+    ) -> Optional[str]:
+        """
+        Fetch the canonical sequence of a polymer entity asynchronously.
+
+        Rate limits, server errors and connection failures are retried with
+        exponential backoff, as in the requests session used by _fetch_sequence.
+
+        Args:
+            session: The aiohttp session to use.
+            entry_id: The PDB entry identifier.
+            entity_id: The entity identifier within the entry.
+
+        Returns:
+            The canonical one-letter sequence, or None if the entity does not exist.
+
+        Raises:
+            Exception: If the entity could not be fetched, even after retries.
+        """
+        sequence = await anyio.to_thread.run_sync(_read_cached_sequence, entry_id, entity_id)
+        if sequence is not None:
+            return sequence
+
+        url = POLYMER_ENTITY_URL.format(entry_id=entry_id, entity_id=entity_id)
+        for attempt in range(_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(_BACKOFF * 2 ** (attempt - 1))
+            try:
+                async with session.get(url, headers={"Accept": "application/json"}) as response:
+                    if response.status in _RETRY_STATUSES and attempt < _RETRIES:
                         continue
-                except Exception:
-                    continue
+                    if response.status == 404:
+                        return None
+                    response.raise_for_status()
+                    data = _json_loads(await response.read())
+                    break
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == _RETRIES:
+                    raise
+
+        sequence = data["entity_poly"]["pdbx_seq_one_letter_code_can"]
+        await anyio.to_thread.run_sync(_write_cached_sequence, entry_id, entity_id, sequence)
+        return sequence
+
+    def _search(
+        self, pdb_ids: List[str], protein_sequence: str
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Look for a candidate whose sequence matches exactly, one request at a time.
+
+        Args:
+            pdb_ids: Candidate polymer entity identifiers.
+            protein_sequence: The protein sequence to match.
+
+        Returns:
+            The matching entry and entity identifiers, or None.
+        """
+        for tmp_pdb in pdb_ids:
+            entry_id, entity_id = tmp_pdb.split("_")
+            if _is_same_sequence(self._fetch_sequence(entry_id, entity_id), protein_sequence):
+                return entry_id, entity_id
+        return None
+
+    async def _search_async(
+        self, pdb_ids: List[str], protein_sequence: str
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Look for a candidate whose sequence matches exactly, fetching concurrently.
 
+        As in _search, the highest-ranked match is returned. Results are awaited in
+        rank order, so the remaining requests are only cancelled once every
+        higher-ranked candidate has been checked.
+        A candidate that cannot be fetched fails the search rather than being
+        skipped, so that an RCSB outage is not reported as a missing match.
+
+        Args:
+            pdb_ids: Candidate polymer entity identifiers.
+            protein_sequence: The protein sequence to match.
+
+        Returns:
+            The matching entry and entity identifiers, or None.
+        """
+        semaphore = asyncio.Semaphore(8)
+
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=sum(_TIMEOUT)),
+        ) as session:
+
+            async def check(entry_id: str, entity_id: str) -> Optional[Tuple[str, str]]:
+                async with semaphore:
+                    sequence = await self._fetch(session, entry_id, entity_id)
+                if _is_same_sequence(sequence, protein_sequence):
+                    return entry_id, entity_id
+                return None
+
+            tasks = [
+                asyncio.create_task(check(*tmp_pdb.split("_"))) for tmp_pdb in pdb_ids
+            ]
+            try:
+                for task in tasks:
+                    match = await task
+                    if match is not None:
+                        return match
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return None
+
+    @staticmethod
+    def _format_match(match: Optional[Tuple[str, str]]) -> str:
+        """
+        Format the search outcome.
+
+        Args:
+            match: The matching entry and entity identifiers, or None.
+
+        Returns:
+            A message describing the match.
+        """
+        if match is None:
             return "Couldn't find a perfect match"
+        entry_id, entity_id = match
+        return f"pdb code {entry_id} with entity id {entity_id}"
+
+    def _run(self, protein_sequence: str) -> str:
+        """Run FindPDBStructure."""
+        try:
+            protein_sequence = "".join(protein_sequence.split())
+            pdb_ids = self._candidates(protein_sequence)
+
+            if aiohttp is None or _has_running_loop():
+                match = self._search(pdb_ids, protein_sequence)
+            else:
+                match = asyncio.run(self._search_async(pdb_ids, protein_sequence))
+
+            return self._format_match(match)
 
         except Exception as e:
             logger.error(f"Error in FindPDBStructure: {e}")
@@ -104,14 +580,29 @@ class FindPDBStructure(BiocatalysisAssistantBaseTool):
 
     async def _arun(self, protein_sequence: str) -> str:
         """
-        Async method for finding pdb structures of a given protein sequence..
+        Async method for finding pdb structures of a given protein sequence.
 
-        Raises:
-            NotImplementedError: Async execution is not implemented.
+        The blocking RCSB search runs in a worker thread, so the event loop
+        stays free while it waits.
+
+        Args:
+            protein_sequence: The protein sequence to search for.
+
+        Returns:
+            A message describing the match.
         """
-        raise NotImplementedError(
-            "Async execution not implemented for FindPDBStructure."
-        )
+        if aiohttp is None:
+            return await anyio.to_thread.run_sync(self._run, protein_sequence)
+
+        try:
+            protein_sequence = "".join(protein_sequence.split())
+            pdb_ids = await anyio.to_thread.run_sync(self._candidates, protein_sequence)
+            match = await self._search_async(pdb_ids, protein_sequence)
+            return self._format_match(match)
+
+        except Exception as e:
+            logger.error(f"Error in FindPDBStructure: {e}")
+            raise ValueError("Failed to get elements of reaction.")
 
 
 class DownloadPDBStructure(BiocatalysisAssistantBaseTool):
@@ -124,18 +615,28 @@ class DownloadPDBStructure(BiocatalysisAssistantBaseTool):
     It takes as input a PDB code (e.g., '1abc') and saves the PDB file in the configured output directory.
     """
 
-    @staticmethod
-    def check_requirements() -> bool:
+    # Set once the requirements are met, reset if the output directory disappears.
+    _requirements_ok: ClassVar[Optional[bool]] = None
+
+    @classmethod
+    def check_requirements(cls) -> bool:
         """
         Check if the required directories for PDB file download exist.
+
+        A successful check is cached and only repeated after a download fails
+        because the output directory is missing.
+
         Returns:
         True if all required directories exist, False otherwise.
         """
+        if cls._requirements_ok:
+            return True
         settings = PDB_SETTINGS
         output_dir = Path(settings.output_dir)
         if not output_dir.exists():
             logger.warning(f"Required directory {output_dir} does not exist.")
             return False
+        cls._requirements_ok = True
         return True
 
     def _run(self, pdb_code: str) -> str:
@@ -153,32 +654,93 @@ class DownloadPDBStructure(BiocatalysisAssistantBaseTool):
         """
         try:
             pdb_code = pdb_code.lower()
+            output_path = Path(PDB_SETTINGS.output_dir) / f"{pdb_code}.pdb"
 
-            url = f"https://files.rcsb.org/download/{pdb_code}.pdb"
+            if output_path.exists():
+                return f"Successfully downloaded PDB file: {output_path}"
 
-            response = requests.get(url)
+            url = f"https://files.rcsb.org/download/{pdb_code}.pdb"
 
-            if response.status_code == 200:
-                output_path = Path(PDB_SETTINGS.output_dir) / f"{pdb_code}.pdb"
+            with _SESSION.get(url, stream=True, timeout=(5, 60)) as response:
+                if response.status_code != 200:
+                    return f"Error: {response.status_code}, Failed to download PDB file for {pdb_code}"
 
-                with Path.open(output_path, "wb") as f:
-                    f.write(response.content)
+                # Stream into a temporary file next to the target, so that an
+                # interrupted download never leaves a partial .pdb behind.
+                response.raw.decode_content = True
+                fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        shutil.copyfileobj(response.raw, f, length=1 << 16)
+                    Path(tmp_name).replace(output_path)
+                finally:
+                    Path(tmp_name).unlink(missing_ok=True)
 
-                return f"Successfully downloaded PDB file: {output_path}"
-            else:
-                return f"Error: {response.status_code}, Failed to download PDB file for {pdb_code}"
+            return f"Successfully downloaded PDB file: {output_path}"
 
         except Exception as e:
+            if isinstance(e, FileNotFoundError):
+                type(self)._requirements_ok = None
             logger.error(f"Error in DownloadPDBStructure: {e}")
             raise ValueError(f"Failed to download PDB file for {pdb_code}.")
 
+    @staticmethod
+    async def _save_pdb(path: Path, chunks: AsyncIterator[bytes]) -> None:
+        """
+        Write a downloaded PDB file without blocking the event loop.
+
+        The content goes to a temporary file that replaces the target once
+        complete, so that an interrupted download never leaves a partial file.
+
+        Args:
+            path: Destination path.
+            chunks: The file content.
+        """
+        tmp_path = anyio.Path(path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp"))
+        try:
+            async with await anyio.open_file(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+            await tmp_path.replace(path)
+        finally:
+            await tmp_path.unlink(missing_ok=True)
+
     async def _arun(self, pdb_code: str) -> str:
         """
         Async method for downloading a PDB structure file.
 
+        Args:
+            pdb_code: The PDB code of the structure to download.
+
+        Returns:
+            A string message indicating success or failure of the download.
+
         Raises:
-            NotImplementedError: Async execution is not implemented.
+            ValueError: If the PDB file download fails.
         """
-        raise NotImplementedError(
-            "Async execution not implemented for DownloadPDBStructure."
-        )
+        if aiohttp is None:
+            return await anyio.to_thread.run_sync(self._run, pdb_code)
+
+        try:
+            pdb_code = pdb_code.lower()
+            output_path = Path(PDB_SETTINGS.output_dir) / f"{pdb_code}.pdb"
+
+            if await anyio.Path(output_path).exists():
+                return f"Successfully downloaded PDB file: {output_path}"
+
+            url = f"https://files.rcsb.org/download/{pdb_code}.pdb"
+
+            async with aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=65)
+            ) as session, session.get(url) as response:
+                if response.status != 200:
+                    return f"Error: {response.status}, Failed to download PDB file for {pdb_code}"
+                await self._save_pdb(output_path, response.content.iter_chunked(1 << 16))
+
+            return f"Successfully downloaded PDB file: {output_path}"
+
+        except Exception as e:
+            if isinstance(e, FileNotFoundError):
+                type(self)._requirements_ok = None
+            logger.error(f"Error in DownloadPDBStructure: {e}")
+            raise ValueError(f"Failed to download PDB file for {pdb_code}.")
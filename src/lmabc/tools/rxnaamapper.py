@@ -25,10 +25,17 @@ SOFTWARE.
 """
 
 
+import asyncio
 import logging
+import stat
+import threading
+from bisect import bisect_left
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List
+from typing import Any, ClassVar, Dict, List, Literal, Optional, Tuple, Union
 
+import numpy as np
+import torch
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from rxn_aa_mapper.aa_mapper import RXNAAMapper
 
@@ -39,6 +46,9 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
 
+_RXNAAMAPPER_CACHE_PATH = BIOCATALYSIS_AGENT_CONFIGURATION.get_tools_cache_path("rxnaamapper")
+
+
 class RXNAAMapperConfiguration(BaseSettings):
     """Configuration values for the RXNAAMapper tool.
 
@@ -50,23 +60,25 @@ class RXNAAMapperConfiguration(BaseSettings):
         head: Head value for the model.
         layers: List of layers for the model.
         top_k: Top K value for predictions.
+        autocast: Whether to run inference under bfloat16 autocast. Off by default,
+            the predicted binding sites have not been checked against float32.
+        dtype: Precision to cast the model weights to after loading, None keeps
+            float32. float16 is only applied when the model runs on CUDA.
+        max_batch_size: Maximum number of concurrent async requests mapped together.
+        max_wait_ms: Time to wait for more async requests before mapping a batch.
     """
 
-    vocabulary_file: str = str(
-        BIOCATALYSIS_AGENT_CONFIGURATION.get_tools_cache_path("rxnaamapper")
-        / "vocabulary.txt"
-    )
-    aa_sequence_tokenizer_filepath: str = str(
-        BIOCATALYSIS_AGENT_CONFIGURATION.get_tools_cache_path("rxnaamapper")
-        / "tokenizer.json"
-    )
+    vocabulary_file: str = str(_RXNAAMAPPER_CACHE_PATH / "vocabulary.txt")
+    aa_sequence_tokenizer_filepath: str = str(_RXNAAMAPPER_CACHE_PATH / "tokenizer.json")
     aa_sequence_tokenizer_type: str = "bert"
-    model_path: str = str(
-        BIOCATALYSIS_AGENT_CONFIGURATION.get_tools_cache_path("rxnaamapper") / "model"
-    )
+    model_path: str = str(_RXNAAMAPPER_CACHE_PATH / "model")
     head: int = 3
     layers: List[int] = [11]
     top_k: int = 1
+    autocast: bool = False
+    dtype: Optional[Literal["float16", "bfloat16"]] = None
+    max_batch_size: int = 16
+    max_wait_ms: float = 50.0
 
     model_config = SettingsConfigDict(
         env_prefix="RXN_AA_MAPPER_", protected_namespaces=("settings_",)
@@ -75,6 +87,243 @@ class RXNAAMapperConfiguration(BaseSettings):
 
 RXNAAMAPPER_SETTINGS = RXNAAMapperConfiguration()
 
+# Serializes the first, expensive, mapper construction.
+_MAPPER_LOCK = threading.Lock()
+
+# The settings are fixed for the process lifetime, so the mapper config is built once.
+_RXNAAMAPPER_CONFIG: Dict[str, Any] = RXNAAMAPPER_SETTINGS.model_dump()
+
+
+@lru_cache(maxsize=1)
+def _load_mapper() -> RXNAAMapper:
+    """
+    Build an RXNAAMapper, loading its tokenizer, vocabulary and model from disk.
+
+    Returns:
+        The mapper instance.
+    """
+    logger.info("Loading RXNAAMapper.")
+    mapper = RXNAAMapper(config=_RXNAAMAPPER_CONFIG)
+    model = getattr(mapper, "model", None)
+    if isinstance(model, torch.nn.Module):
+        model.eval()
+        dtype = RXNAAMAPPER_SETTINGS.dtype
+        if dtype == "float16" and next(model.parameters()).device.type != "cuda":
+            logger.warning("float16 inference requires CUDA, keeping float32 weights.")
+        elif dtype is not None:
+            model.to(getattr(torch, dtype))
+    return mapper
+
+
+def _get_mapper() -> RXNAAMapper:
+    """
+    Get the shared RXNAAMapper, building it on first use.
+
+    Returns:
+        The cached mapper instance.
+    """
+    with _MAPPER_LOCK:
+        return _load_mapper()
+
+
+def _split_reaction(rxn: str) -> Tuple[str, str, str]:
+    """
+    Split a reaction SMILES into its elements in a single pass.
+
+    Args:
+        rxn: Reaction SMILES in the form 'reactants|aa_sequence>>products', the
+            last two elements being optional.
+
+    Returns:
+        The reactants, amino acid sequence and products, empty if missing.
+    """
+    arrow = rxn.find(">>")
+    end = arrow if arrow >= 0 else len(rxn)
+    # Only a bar before the arrow separates the sequence, product SMILES may carry
+    # CXSMILES extensions such as |f:0.1|.
+    bar = rxn.find("|", 0, end)
+    if bar < 0:
+        return rxn[:end].strip(), "", rxn[end + 2 :].strip()
+    return rxn[:bar].strip(), rxn[bar + 1 : end].strip(), rxn[end + 2 :].strip()
+
+
+# Upper sequence lengths of the buckets mapped together, longer sequences form one more bucket.
+_LENGTH_BUCKETS = (64, 128, 256, 512, 1024)
+
+# Below this many predicted intervals a plain loop filters faster than a NumPy mask.
+_VECTORIZE_MIN_INTERVALS = 32
+
+
+def _extract_binding_sites(rxns: List[str]) -> List[str]:
+    """
+    Extract the binding sites of several reactions with batched mapper calls.
+
+    Reactions are grouped by sequence length bucket and each bucket is mapped
+    in a single call, so that a batch is never padded past its bucket. The
+    results are returned in input order.
+
+    Args:
+        rxns: Reaction SMILES strings.
+
+    Returns:
+        The binding sites, or an error message, for each reaction.
+    """
+    seq_lengths = {rxn: len(_split_reaction(rxn)[1]) for rxn in rxns if rxn}
+    buckets: Dict[int, List[str]] = {}
+    for rxn in sorted(seq_lengths, key=seq_lengths.__getitem__):
+        buckets.setdefault(bisect_left(_LENGTH_BUCKETS, seq_lengths[rxn]), []).append(rxn)
+
+    active_sites: Dict[str, Any] = {}
+    if buckets:
+        mapper = _get_mapper()
+        with torch.inference_mode(), torch.autocast(
+            device_type="cuda" if torch.cuda.is_available() else "cpu",
+            dtype=torch.bfloat16,
+            enabled=RXNAAMAPPER_SETTINGS.autocast,
+        ):
+            for bucket_rxns in buckets.values():
+                mapped_rxns = mapper.get_reactant_aa_sequence_attention_guided_maps(bucket_rxns)
+                for rxn, mapped_rxn in zip(bucket_rxns, mapped_rxns):
+                    active_sites[rxn] = mapper.get_predicted_active_site(
+                        mapped_rxn["mapped_rxn"]
+                    )
+
+    results = []
+    for rxn in rxns:
+        if not rxn:
+            results.append("Reaction SMILES string is empty.")
+            continue
+
+        seq_length = seq_lengths[rxn]
+        intervals = active_sites[rxn]
+        if len(intervals) > _VECTORIZE_MIN_INTERVALS:
+            keep = np.flatnonzero(np.asarray(intervals)[:, 1] <= seq_length)
+            clean_intervals = [intervals[i] for i in keep]
+        else:
+            clean_intervals = [interval for interval in intervals if interval[1] <= seq_length]
+
+        if len(clean_intervals) == 0:
+            results.append("Failed to extract binding sites.")
+        else:
+            results.append(str(clean_intervals))
+
+    return results
+
+
+class _ReactionBatcher:
+    """Coalesces concurrent async binding site requests into batched mapper calls."""
+
+    def __init__(self) -> None:
+        """Initialize the batcher, its queue is bound to the first event loop using it."""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[Tuple[str, asyncio.Future]]"] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def submit(self, rxn: str) -> str:
+        """
+        Queue a reaction and wait for its batch to be processed.
+
+        Args:
+            rxn: The reaction SMILES string.
+
+        Returns:
+            The binding sites, or an error message, for the reaction.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._queue is None:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            # Keep a reference, the event loop only holds tasks weakly.
+            self._task = loop.create_task(self._consume(self._queue))
+            self._task.add_done_callback(partial(self._on_consumer_done, self._queue))
+        future = loop.create_future()
+        await self._queue.put((rxn, future))
+        return await future
+
+    def _on_consumer_done(
+        self, queue: "asyncio.Queue[Tuple[str, asyncio.Future]]", task: "asyncio.Task[None]"
+    ) -> None:
+        """
+        Fail the queued requests when the consumer stops, instead of leaving them waiting.
+
+        The next request then starts a new consumer.
+
+        Args:
+            queue: The queue the consumer was draining.
+            task: The consumer task.
+        """
+        if self._queue is queue:
+            self._queue = None
+            self._task = None
+        error = None if task.cancelled() else task.exception()
+        if error is not None:
+            logger.error(f"Binding site batcher stopped: {error}")
+        while not queue.empty():
+            _, future = queue.get_nowait()
+            if future.done():
+                continue
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+
+    @staticmethod
+    async def _consume(queue: "asyncio.Queue[Tuple[str, asyncio.Future]]") -> None:
+        """
+        Drain the queue in batches of up to max_batch_size reactions.
+
+        A batch is dispatched once it is full or max_wait_ms after its first reaction.
+        If the consumer stops, the requests of the current batch fail with it.
+
+        Args:
+            queue: The queue of reactions and the futures awaiting their result.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            try:
+                deadline = loop.time() + RXNAAMAPPER_SETTINGS.max_wait_ms / 1000
+                while len(batch) < RXNAAMAPPER_SETTINGS.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                try:
+                    results = await asyncio.to_thread(
+                        _extract_binding_sites, [rxn for rxn, _ in batch]
+                    )
+                except Exception:
+                    # Retry one by one, so a malformed reaction only fails its own request.
+                    for rxn, future in batch:
+                        try:
+                            result = (await asyncio.to_thread(_extract_binding_sites, [rxn]))[0]
+                        except Exception as e:
+                            if not future.done():
+                                future.set_exception(e)
+                        else:
+                            if not future.done():
+                                future.set_result(result)
+                    continue
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except BaseException as e:
+                for _, future in batch:
+                    if future.done():
+                        continue
+                    if isinstance(e, Exception):
+                        future.set_exception(e)
+                    else:
+                        future.cancel()
+                raise
+
+
+_BATCHER = _ReactionBatcher()
+
 
 class ExtractBindingSites(BiocatalysisAssistantBaseTool):
     """Tool for extracting binding sites from reaction SMILES."""
@@ -85,91 +334,115 @@ class ExtractBindingSites(BiocatalysisAssistantBaseTool):
     Input Format:
         - Reaction SMILES must follow this structure: substrate SMILES | amino acid sequence >> product SMILES
         - Example:  CC(=O)Cc1ccccc1|MTENALVR>>CC(O)Cc1ccccc1
+        - A list of reaction SMILES can be given to process several reactions at once.
 """
 
-    @staticmethod
-    def check_requirements() -> bool:
+    # Set once the requirements are met, reset if the model files disappear.
+    _requirements_ok: ClassVar[Optional[bool]] = None
+
+    @classmethod
+    def check_requirements(cls) -> bool:
         """
         Check if the required directories and files for RXNAAMapper exist.
 
+        A successful check is cached and only repeated after a run fails
+        because a model file is missing.
+
         Returns:
             Boolean indicating if all requirements are met.
         """
+        if cls._requirements_ok:
+            return True
+
         settings = RXNAAMAPPER_SETTINGS
 
         paths_to_check = [
-            settings.model_path,
-            settings.vocabulary_file,
-            settings.aa_sequence_tokenizer_filepath,
+            (settings.model_path, stat.S_ISDIR, "directory"),
+            (settings.vocabulary_file, stat.S_ISREG, "file"),
+            (settings.aa_sequence_tokenizer_filepath, stat.S_ISREG, "file"),
         ]
 
-        for path in paths_to_check:
-            path_obj = Path(path)
-            expected_type = "directory" if path == settings.model_path else "file"
-
-            if not path_obj.exists():
+        # One stat call per path, the mode bits answer both the existence and type checks.
+        for path, is_expected_type, expected_type in paths_to_check:
+            try:
+                mode = Path(path).stat().st_mode
+            except OSError:
                 logger.warning(f"Required {expected_type} {path} does not exist.")
                 return False
 
-            if expected_type == "directory" and not path_obj.is_dir():
-                logger.warning(f"{path} exists but is not a directory.")
-                return False
-            elif expected_type == "file" and not path_obj.is_file():
-                logger.warning(f"{path} exists but is not a file.")
+            if not is_expected_type(mode):
+                logger.warning(f"{path} exists but is not a {expected_type}.")
                 return False
 
+        cls._requirements_ok = True
         return True
 
-    def _run(self, reaction_smiles: str) -> str:
+    def _run(self, reaction_smiles: Union[str, List[str]]) -> Union[str, List[str]]:
         """
         Run binding site extraction.
 
+        All reactions are mapped in a single batched mapper call.
+
         Args:
-            reaction_smiles: The reaction SMILES string.
+            reaction_smiles: The reaction SMILES string, or a list of them.
 
         Returns:
-            String containing the extracted binding sites or an error message.
+            String containing the extracted binding sites or an error message,
+            or a list of such strings if a list of reactions was given.
 
         Raises:
             ValueError: If binding site extraction fails.
         """
         if not reaction_smiles:
-            return "Reaction SMILES string is empty."
+            return "Reaction SMILES string is empty." if isinstance(reaction_smiles, str) else []
+
+        rxns = (
+            [reaction_smiles]
+            if isinstance(reaction_smiles, str)
+            else list(reaction_smiles)
+        )
 
         try:
-            mapper = RXNAAMapper(config=RXNAAMAPPER_SETTINGS.model_dump())
-            intervals = mapper.get_predicted_active_site(
-                mapper.get_reactant_aa_sequence_attention_guided_maps(
-                    [reaction_smiles]
-                )[0]["mapped_rxn"]
-            )
-            seq_length = len(reaction_smiles.split("|")[1].split(">>")[0].strip())
-            clean_intervals = [
-                interval for interval in intervals if interval[1] <= seq_length
-            ]
-
-            if len(clean_intervals) == 0:
-                return "Failed to extract binding sites."
-            else:
-                return str(clean_intervals)
+            results = _extract_binding_sites(rxns)
+            return results[0] if isinstance(reaction_smiles, str) else results
 
         except Exception as e:
+            if isinstance(e, FileNotFoundError):
+                type(self)._requirements_ok = None
             logger.error(f"Error in ExtractBindingSites: {e}")
             raise ValueError("Failed to extract binding sites.")
 
-    async def _arun(self, reaction_smiles: str) -> str:
+    async def _arun(
+        self, reaction_smiles: Union[str, List[str]]
+    ) -> Union[str, List[str]]:
         """
         Async method for binding site extraction.
 
+        Concurrent calls are coalesced into batched mapper calls.
+
         Args:
-            reaction_smiles: The reaction SMILES string.
+            reaction_smiles: The reaction SMILES string, or a list of them.
+
+        Returns:
+            String containing the extracted binding sites or an error message,
+            or a list of such strings if a list of reactions was given.
 
         Raises:
-            NotImplementedError: Async execution is not implemented.
+            ValueError: If binding site extraction fails.
         """
-        raise NotImplementedError(
-            "Async execution not implemented for ExtractBindingSites."
-        )
+        if not reaction_smiles:
+            return "Reaction SMILES string is empty." if isinstance(reaction_smiles, str) else []
+
+        if not isinstance(reaction_smiles, str):
+            return await asyncio.to_thread(self._run, reaction_smiles)
+
+        try:
+            return await _BATCHER.submit(reaction_smiles)
+        except Exception as e:
+            if isinstance(e, FileNotFoundError):
+                type(self)._requirements_ok = None
+            logger.error(f"Error in ExtractBindingSites: {e}")
+            raise ValueError("Failed to extract binding sites.")
 
 
 class GetElementsOfReaction(BiocatalysisAssistantBaseTool):
@@ -220,18 +493,7 @@ class GetElementsOfReaction(BiocatalysisAssistantBaseTool):
             return "Reaction SMILES string is empty."
 
         try:
-            reaction_separator = ">>"
-            smiles_aa_sequence_separator = "|"
-
-            reactants, aa_sequence, products = "", "", ""
-            try:
-                precursors, products = reaction_smiles.split(reaction_separator)
-            except Exception:
-                precursors = reaction_smiles
-            try:
-                reactants, aa_sequence = precursors.split(smiles_aa_sequence_separator)
-            except Exception:
-                reactants = precursors
+            reactants, aa_sequence, products = _split_reaction(reaction_smiles)
             return f"Reactants: {reactants}, AA Sequence: {aa_sequence}, Products: {products}"
         except Exception as e:
             logger.error(f"Error in GetElementsOfReaction: {e}")
@@ -25,30 +25,678 @@ SOFTWARE.
 """
 
 
-from typing import Union
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
+import langchain_core
+import numpy as np
 from langchain.agents import AgentExecutor
-from langchain.agents.format_scratchpad import format_log_to_str
 from langchain.agents.output_parsers import JSONAgentOutputParser
 from langchain.chat_models.base import BaseChatModel
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import (
+    ConversationBufferMemory,
+    ConversationBufferWindowMemory,
+    ConversationTokenBufferMemory,
+)
 from langchain.tools.render import render_text_description_and_args
+from langchain_core.agents import AgentAction, AgentFinish
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForChainRun,
+    CallbackManagerForChainRun,
+)
+from langchain_core.exceptions import OutputParserException
 from langchain_core.language_models.llms import BaseLLM
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableConfig, RunnableLambda, RunnablePassthrough
 from langchain_core.tools import BaseTool
+from langchain_core.utils.json import parse_json_markdown
+from pydantic import BaseModel, Field
+
+from ..configuration import BIOCATALYSIS_AGENT_CONFIGURATION
+
+_json_loads: Callable[[Union[str, bytes]], Any]
+try:
+    from orjson import OPT_SORT_KEYS
+    from orjson import dumps as _orjson_dumps
+    from orjson import loads as _json_loads
+
+    def _canonical_json(obj: Any) -> bytes:
+        return _orjson_dumps(obj, default=str, option=OPT_SORT_KEYS)
+
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
+    def _canonical_json(obj: Any) -> bytes:
+        return json.dumps(obj, default=str, sort_keys=True).encode()
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Content of the first fenced code block, optionally tagged as json.
+_JSON_FENCE_RE = re.compile(r"```(?:json)?(.*?)```", re.DOTALL)
+
+# Agent prompts with the tools rendered in, keyed by the prompt templates and by
+# the tool classes, names and descriptions.
+_PROMPTS: Dict[Tuple[str, str, Tuple[Tuple[type, str, str], ...]], ChatPromptTemplate] = {}
+
+
+def _render_tools(tools: Sequence[BaseTool]) -> str:
+    """Render the tool descriptions, reusing the rendering of previous processes.
+
+    The rendering is stored on disk under a digest of the langchain version and
+    of the tool classes, names, descriptions and argument schemas, which is all
+    the rendering depends on, so changing a tool or upgrading langchain
+    invalidates it.
+
+    Args:
+        tools: list of tools for the agent.
+
+    Returns:
+        the rendered tool descriptions.
+    """
+    digest = hashlib.blake2b(langchain_core.__version__.encode(), digest_size=16)
+    for t in tools:
+        tool_class = type(t)
+        fingerprint = [
+            tool_class.__module__,
+            tool_class.__qualname__,
+            t.name,
+            t.description,
+            json.dumps(t.args, sort_keys=True, default=str),
+        ]
+        digest.update(json.dumps(fingerprint).encode())
+    cache_path = (
+        BIOCATALYSIS_AGENT_CONFIGURATION.local_cache_path / "prompts" / f"{digest.hexdigest()}.txt"
+    )
+    try:
+        return cache_path.read_text()
+    except OSError:
+        pass
+
+    rendered = render_text_description_and_args(list(tools))
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(rendered)
+            Path(tmp_name).replace(cache_path)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+    except OSError as e:
+        logger.debug(f"Could not cache rendered tools at {cache_path}: {e}")
+    return rendered
+
+
+def _build_prompt(
+    tools: Sequence[BaseTool], system_prompt: str, human_prompt: str
+) -> ChatPromptTemplate:
+    """Build the agent prompt with the tool descriptions and names filled in.
+
+    Rendering the tools serializes every tool schema, so the prompt is cached
+    for identical templates and sets of tools. The tools are listed at the end
+    of the system prompt, so the static instructions form a stable prefix for
+    the prompt caching of the LLM providers.
+
+    Args:
+        tools: list of tools for the agent.
+        system_prompt: the system message template.
+        human_prompt: the human message template.
+
+    Returns:
+        the agent prompt.
+    """
+    # A deterministic tool order keeps the rendered prompt byte-identical across runs.
+    tools = sorted(tools, key=lambda t: t.name)
+    key = (
+        system_prompt,
+        human_prompt,
+        tuple((type(t), t.name, t.description) for t in tools),
+    )
+    prompt = _PROMPTS.get(key)
+    if prompt is None:
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system_prompt),
+            MessagesPlaceholder("chat_history", optional=True),
+            ("human", human_prompt),
+        ]).partial(
+            tools=_render_tools(tools),
+            tool_names=", ".join([t.name for t in tools]),
+        )
+        _PROMPTS[key] = prompt
+    return prompt
+
+
+class CustomJSONAssistantOutputParser(JSONAgentOutputParser):
+    """Parses the JSON blob of a single action from the agent output.
+
+    Well formed blobs are decoded directly, anything else goes through the
+    lenient markdown JSON parsing of the base parser.
+    """
+
+    @staticmethod
+    def _extract_clean_json(text: str) -> str:
+        """Extract the JSON blob from the agent output.
+
+        Args:
+            text: the agent output.
+
+        Outputs that are exactly one fenced block are sliced, the regex only
+        scans outputs with text around the block.
+
+        Returns:
+            the content of the first fenced code block, or the stripped text if there is none.
+        """
+        stripped = text.strip()
+        if stripped.endswith("```") and stripped.count("```") == 2:
+            if stripped.startswith("```json"):
+                return stripped[7:-3].strip()
+            if stripped.startswith("```"):
+                return stripped[3:-3].strip()
+        elif "```" not in stripped:
+            return stripped
+        match = _JSON_FENCE_RE.search(stripped)
+        return (match.group(1) if match else stripped).strip()
+
+    def parse(self, text: str) -> Union[AgentAction, AgentFinish]:
+        """Parse the agent output into an action or a final answer.
+
+        Outputs without any JSON object are plain text answers and are returned
+        as the final answer without attempting to parse them.
+
+        Args:
+            text: the agent output.
+
+        Returns:
+            the agent action, or the agent finish for a final answer.
+
+        Raises:
+            OutputParserException: if the output does not contain a valid action.
+        """
+        if "{" not in text:
+            return AgentFinish({"output": text.strip()}, text)
+
+        try:
+            try:
+                response: Any = _json_loads(self._extract_clean_json(text))
+            except ValueError:
+                response = parse_json_markdown(text)
+            if isinstance(response, list):
+                logger.warning(f"Got multiple action responses: {response}")
+                response = response[0]
+            if response["action"] == "Final Answer":
+                return AgentFinish({"output": response["action_input"]}, text)
+            action_input = response.get("action_input", {})
+            if action_input is None:
+                action_input = {}
+            return AgentAction(response["action"], action_input, text)
+        except Exception as e:
+            raise OutputParserException(f"Could not parse LLM output: {text}") from e
+
+
+def _format_log_to_str(intermediate_steps: Sequence[Tuple[AgentAction, str]]) -> str:
+    """Format intermediate steps like format_log_to_str, joining the parts once.
+
+    Args:
+        intermediate_steps: the actions taken and their observations.
+
+    Returns:
+        the formatted steps.
+    """
+    parts = []
+    for action, observation in intermediate_steps:
+        parts.append(action.log)
+        parts.append(f"\nObservation: {observation}\nThought: ")
+    return "".join(parts)
+
+
+def _action_key(action: AgentAction) -> Tuple[str, bytes]:
+    """Identify an action by its tool and its canonically serialized input.
+
+    Args:
+        action: an agent action.
+
+    Returns:
+        the tool name and the input serialized with sorted keys.
+    """
+    return action.tool, _canonical_json(action.tool_input)
+
+
+def _stop_on_repeated_action(x: Dict[str, Any]) -> Union[AgentAction, AgentFinish]:
+    """Finish the run when the agent repeats an action it already took.
+
+    A repeated action would return the same observation, so the run ends with a
+    final answer stating the repeat and quoting the earlier result, instead of
+    spending more LLM turns.
+
+    Args:
+        x: the agent inputs, with the intermediate steps and the parsed LLM output.
+
+    Returns:
+        the parsed LLM output, or a final answer when the action is a repeat.
+    """
+    output = x["output"]
+    if not isinstance(output, AgentAction):
+        return output
+    key = _action_key(output)
+    for action, observation in x["intermediate_steps"]:
+        if _action_key(action) == key:
+            logger.info(f"Stopping on repeated action {output.tool}.")
+            message = (
+                f"Stopped: the {output.tool} tool was called again with the same input. "
+                f"Last result: {observation}"
+            )
+            return AgentFinish(return_values={"output": message}, log=message)
+    return output
+
+
+class IncrementalScratchpad:
+    """Renders the agent scratchpad, formatting each intermediate step only once.
+
+    The executor appends to the same list of intermediate steps during a run,
+    so one formatted fragment is kept per step, only new steps are formatted,
+    and the scratchpad is joined from the fragments in a single pass.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty scratchpad."""
+        self._lock = threading.Lock()
+        self._steps: Optional[List[Tuple[AgentAction, str]]] = None
+        self._fragments: List[str] = []
+        self._text = ""
+
+    def render(self, intermediate_steps: List[Tuple[AgentAction, str]]) -> str:
+        """Render the intermediate steps of the current run.
+
+        Args:
+            intermediate_steps: the actions taken so far and their observations.
+
+        Returns:
+            the formatted scratchpad.
+        """
+        with self._lock:
+            if intermediate_steps is not self._steps or len(intermediate_steps) < len(
+                self._fragments
+            ):
+                self._steps, self._fragments, self._text = intermediate_steps, [], ""
+            if len(intermediate_steps) > len(self._fragments):
+                self._fragments.extend(
+                    _format_log_to_str([step])
+                    for step in intermediate_steps[len(self._fragments) :]
+                )
+                self._text = "".join(self._fragments)
+            return self._text
+
+
+class ParallelActionsInput(BaseModel):
+    """Input of the Parallel tool."""
+
+    actions: List[Dict[str, Any]] = Field(
+        description='List of {"action": tool name, "action_input": tool input} objects.'
+    )
+
+
+class ParallelTools(BaseTool):
+    """Runs several independent tool actions concurrently in a single agent step."""
+
+    name: str = "Parallel"
+    description: str = """Runs several tool actions at the same time and returns all their observations.
+    Use it only when the actions do not depend on each other's results, e.g.
+    {"actions": [{"action": $TOOL_NAME_1, "action_input": $INPUT_1}, {"action": $TOOL_NAME_2, "action_input": $INPUT_2}]}
+    """
+    args_schema: type[BaseModel] = ParallelActionsInput
+    tools: Dict[str, BaseTool] = Field(default_factory=dict, exclude=True)
+
+    @staticmethod
+    def _format(name: str, observation: Any) -> str:
+        """Format the observation of one action.
+
+        Args:
+            name: the tool name.
+            observation: the tool output.
+
+        Returns:
+            the labelled observation.
+        """
+        return f"{name}: {observation}"
+
+    def _run_action(self, action: Dict[str, Any]) -> str:
+        """Run a single action, reporting failures as its observation.
+
+        Args:
+            action: the action, with the tool name and the tool input.
+
+        Returns:
+            the labelled observation.
+        """
+        name = action.get("action", "")
+        tool_input = action.get("action_input")
+        tool = self.tools.get(name)
+        if tool is None:
+            return self._format(name, "is not a valid tool.")
+        try:
+            return self._format(name, tool.invoke({} if tool_input is None else tool_input))
+        except Exception as e:
+            logger.error(f"Error in Parallel running {name}: {e}")
+            return self._format(name, f"Error: {e}")
+
+    async def _arun_action(self, action: Dict[str, Any]) -> str:
+        """Run a single action asynchronously, reporting failures as its observation.
+
+        Args:
+            action: the action, with the tool name and the tool input.
+
+        Returns:
+            the labelled observation.
+        """
+        name = action.get("action", "")
+        tool_input = action.get("action_input")
+        tool = self.tools.get(name)
+        if tool is None:
+            return self._format(name, "is not a valid tool.")
+        try:
+            return self._format(name, await tool.ainvoke({} if tool_input is None else tool_input))
+        except Exception as e:
+            logger.error(f"Error in Parallel running {name}: {e}")
+            return self._format(name, f"Error: {e}")
+
+    def _run(self, actions: List[Dict[str, Any]]) -> str:
+        """Run the actions in a thread pool.
+
+        Args:
+            actions: the actions to run.
+
+        Returns:
+            the observations of all actions, one per line, in the given order.
+        """
+        if not actions:
+            return "No actions given."
+        with ThreadPoolExecutor(max_workers=len(actions)) as pool:
+            return "\n".join(pool.map(self._run_action, actions))
+
+    async def _arun(self, actions: List[Dict[str, Any]]) -> str:
+        """Run the actions concurrently on the event loop.
+
+        Args:
+            actions: the actions to run.
+
+        Returns:
+            the observations of all actions, one per line, in the given order.
+        """
+        if not actions:
+            return "No actions given."
+        return "\n".join(await asyncio.gather(*(self._arun_action(a) for a in actions)))
+
+
+# Characters found in SMILES, reaction SMILES, identifiers and numbers, but not in words.
+_ENTITY_CHARS_RE = re.compile(r"[\d()\[\]=#@+\\/|>*%.]")
+
+
+def _entity_tokens(text: str) -> Tuple[str, ...]:
+    """Extract the tokens of a question that name a molecule, reaction, sequence or number.
+
+    Tokens containing digits or SMILES symbols are kept, as are upper case tokens
+    such as amino acid sequences or aliphatic SMILES.
+
+    Args:
+        text: the question.
+
+    Returns:
+        the tokens, in order of appearance.
+    """
+    tokens = []
+    for token in text.split():
+        token = token.strip(",;:!?\"'`").rstrip(".")
+        if _ENTITY_CHARS_RE.search(token) or (
+            len(token) > 1 and token.replace("-", "").isupper()
+        ):
+            tokens.append(token)
+    return tuple(tokens)
+
+
+class SemanticCache:
+    """Cache of agent answers, looked up by the semantic similarity of the questions.
+
+    Questions are embedded with a sentence transformer, and an answer is reused
+    when the cosine similarity of a new question to a cached one reaches the
+    threshold. Sentence embeddings barely change when one atom of a SMILES or one
+    residue of a sequence does, so a cached answer is only reused when both
+    questions name exactly the same molecules, reactions, sequences and numbers.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        max_entries: int = 1024,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            threshold: minimum cosine similarity for a cache hit.
+            model_name: sentence transformer used to embed the questions.
+            max_entries: number of answers kept, the oldest are dropped first.
+        """
+        self.threshold = threshold
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._model: Any = None
+        self._lock = threading.Lock()
+        self._embeddings: Optional[np.ndarray] = None
+        self._entities: List[Tuple[str, ...]] = []
+        self._answers: List[Any] = []
+
+    def _embed(self, text: str) -> np.ndarray:
+        """Embed a question, loading the sentence transformer on first use.
+
+        Args:
+            text: the question.
+
+        Returns:
+            the normalized embedding.
+        """
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            self._model = SentenceTransformer(self.model_name)
+        return np.asarray(self._model.encode(text, normalize_embeddings=True), dtype=np.float32)
+
+    def lookup(self, text: str) -> Tuple[Optional[Any], np.ndarray]:
+        """Look up the answer to the most similar cached question.
+
+        Args:
+            text: the question.
+
+        Returns:
+            the cached answer, or None on a miss, and the question embedding.
+        """
+        embedding = self._embed(text)
+        entities = _entity_tokens(text)
+        with self._lock:
+            if self._embeddings is None:
+                return None, embedding
+            candidates = [i for i, other in enumerate(self._entities) if other == entities]
+            if not candidates:
+                return None, embedding
+            similarities = self._embeddings[candidates] @ embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                return self._answers[candidates[best]], embedding
+        return None, embedding
+
+    def add(self, text: str, embedding: np.ndarray, answer: Any) -> None:
+        """Store the answer to a question.
+
+        Args:
+            text: the question.
+            embedding: the question embedding, as returned by lookup.
+            answer: the answer.
+        """
+        entities = _entity_tokens(text)
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = embedding[None, :]
+            else:
+                self._embeddings = np.vstack([self._embeddings, embedding])[-self.max_entries :]
+            self._entities = [*self._entities, entities][-self.max_entries :]
+            self._answers = [*self._answers, answer][-self.max_entries :]
+
+
+# Whether the current run finished with a final answer from the LLM, set when
+# the executor returns and read back by CachedAgentExecutor.invoke.
+_CLEAN_FINISH: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "clean_finish", default=False
+)
+
+
+def _is_clean_finish(
+    output: AgentFinish, intermediate_steps: List[Tuple[AgentAction, str]]
+) -> bool:
+    """Check whether a run ended with a final answer, without stops or parsing errors.
+
+    Runs stopped on the iteration limit finish with an empty log, and runs stopped
+    on a repeated action with a "Stopped:" message.
+
+    Args:
+        output: the final output of the run.
+        intermediate_steps: the actions taken and their observations.
+
+    Returns:
+        whether the answer can be cached.
+    """
+    if not output.log or output.log.startswith("Stopped:"):
+        return False
+    return all(action.tool != "_Exception" for action, _ in intermediate_steps)
+
+
+class CachedAgentExecutor(AgentExecutor):
+    """Agent executor answering repeated questions from a semantic cache.
+
+    Only answers of runs that finished normally are cached, and the cache is
+    bypassed once the conversation has a history, since the answer may then
+    depend on earlier exchanges.
+    """
+
+    semantic_cache: Optional[SemanticCache] = Field(default=None, exclude=True)
+
+    def _return(
+        self,
+        output: AgentFinish,
+        intermediate_steps: list,
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+    ) -> Dict[str, Any]:
+        """Record whether the run finished cleanly, then build the outputs."""
+        _CLEAN_FINISH.set(_is_clean_finish(output, intermediate_steps))
+        return super()._return(output, intermediate_steps, run_manager=run_manager)
+
+    async def _areturn(
+        self,
+        output: AgentFinish,
+        intermediate_steps: list,
+        run_manager: Optional[AsyncCallbackManagerForChainRun] = None,
+    ) -> Dict[str, Any]:
+        """Record whether the run finished cleanly, then build the outputs."""
+        _CLEAN_FINISH.set(_is_clean_finish(output, intermediate_steps))
+        return await super()._areturn(output, intermediate_steps, run_manager=run_manager)
+
+    def _cached_answer(self, inputs: Any) -> Tuple[Optional[Dict[str, Any]], Any]:
+        """Look up the answer to the question in the cache.
+
+        Args:
+            inputs: the agent inputs.
+
+        Returns:
+            the agent outputs on a hit or None, and the question embedding when the
+            question is cacheable.
+        """
+        if self.semantic_cache is None or not isinstance(inputs, dict):
+            return None, None
+        if self.memory is not None and any(self.memory.load_memory_variables({}).values()):
+            return None, None
+        question = inputs.get("input")
+        if not isinstance(question, str):
+            return None, None
+        answer, embedding = self.semantic_cache.lookup(question)
+        if answer is None:
+            return None, embedding
+        logger.info("Answering from the semantic cache.")
+        if self.memory is not None:
+            self.memory.save_context({"input": question}, {"output": answer})
+        return {**inputs, "output": answer}, embedding
+
+    def invoke(
+        self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Run the agent, unless the question has a cached answer.
+
+        Args:
+            input: the agent inputs.
+            config: the runnable configuration.
+
+        Returns:
+            the agent outputs.
+        """
+        outputs, embedding = self._cached_answer(input)
+        if outputs is not None:
+            return outputs
+        _CLEAN_FINISH.set(False)
+        outputs = super().invoke(input, config, **kwargs)
+        if embedding is not None and self.semantic_cache is not None and _CLEAN_FINISH.get():
+            self.semantic_cache.add(input["input"], embedding, outputs["output"])
+        return outputs
+
+    async def ainvoke(
+        self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Run the agent asynchronously, unless the question has a cached answer.
+
+        Args:
+            input: the agent inputs.
+            config: the runnable configuration.
+
+        Returns:
+            the agent outputs.
+        """
+        outputs, embedding = await asyncio.to_thread(self._cached_answer, input)
+        if outputs is not None:
+            return outputs
+        _CLEAN_FINISH.set(False)
+        outputs = await super().ainvoke(input, config, **kwargs)
+        if embedding is not None and self.semantic_cache is not None and _CLEAN_FINISH.get():
+            self.semantic_cache.add(input["input"], embedding, outputs["output"])
+        return outputs
 
 
 def create_agent(
     tools: list[BaseTool],
     llm: Union[BaseChatModel, BaseLLM],
     use_memory: bool = True,
+    memory_window: Optional[int] = None,
+    memory_max_tokens: Optional[int] = None,
+    semantic_cache: Optional[SemanticCache] = None,
 ) -> AgentExecutor:
     """Create an agent executor.
 
     Args:
         tools: list of tools for the agent.
         llm: a langchain base chat model.
+        use_memory: whether to keep the conversation history.
+        memory_window: number of past exchanges sent to the LLM, None keeps the whole history.
+        memory_max_tokens: token budget of the history sent to the LLM, the oldest messages
+            are dropped first. Takes precedence over memory_window when set.
+        semantic_cache: cache answering questions similar to previous ones, None disables it.
 
     Returns:
         an agent executor.
@@ -57,10 +705,9 @@ def create_agent(
     system_prompt = """You are an intelligent assistant with access to tools that can help you answer various questions and perform tasks.
     Respond to the human as helpfully and accurately as possible.
     You want to use JSON BLOBS of single actions to reply to the human as well as possible.
-    Respond to the human as helpfully and accurately as possible. Here are the tools that you can use:
-    {tools}
+    Respond to the human as helpfully and accurately as possible. The tools that you can use are listed at the end.
     Use a json blob to specify a tool by providing an action key (tool name) and an action_input key (tool input).
-    Valid "action" values: "Final Answer" or {tool_names}
+    Valid "action" values: "Final Answer" or one of the tool names listed at the end.
     Provide only ONE action per $JSON_BLOB, as shown:
     ```json
     {{
@@ -104,6 +751,10 @@ def create_agent(
         - NEVER modify, round, or make up scores - use exactly what's in the results
         - Only rerun optimization if new parameters or sequences are requested
 
+    Here are the tools that you can use:
+    {tools}
+    Tool names: {tool_names}
+
     Begin!
     """
 
@@ -111,36 +762,56 @@ def create_agent(
     {agent_scratchpad}
     (reminder to respond in a JSON blob no matter what)"""
 
-    memory =  ConversationBufferMemory(
-        memory_key="chat_history",
-        return_messages=True,
-        output_key="output"
-    ) if use_memory else None
-
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
-        MessagesPlaceholder("chat_history", optional=True),
-        ("human", human_prompt),
-    ]).partial(
-        tools=render_text_description_and_args(list(tools)),
-        tool_names=", ".join([t.name for t in tools]),
-    )
+    memory: Optional[
+        Union[
+            ConversationBufferMemory,
+            ConversationBufferWindowMemory,
+            ConversationTokenBufferMemory,
+        ]
+    ] = None
+    if use_memory and memory_max_tokens is not None:
+        memory = ConversationTokenBufferMemory(
+            llm=llm,
+            max_token_limit=memory_max_tokens,
+            memory_key="chat_history",
+            return_messages=True,
+            output_key="output"
+        )
+    elif use_memory and memory_window is not None:
+        memory = ConversationBufferWindowMemory(
+            k=memory_window,
+            memory_key="chat_history",
+            return_messages=True,
+            output_key="output"
+        )
+    elif use_memory:
+        memory = ConversationBufferMemory(
+            memory_key="chat_history",
+            return_messages=True,
+            output_key="output"
+        )
+
+    if len(tools) > 1:
+        tools = [*tools, ParallelTools(tools={t.name: t for t in tools})]
+
+    scratchpad = IncrementalScratchpad()
+
+    prompt = _build_prompt(tools, system_prompt, human_prompt)
 
     agent = (
         RunnablePassthrough.assign(
-            agent_scratchpad=lambda x: format_log_to_str(x["intermediate_steps"]),
+            agent_scratchpad=lambda x: scratchpad.render(x["intermediate_steps"]),
             chat_history=lambda x: (  #  noqa: ARG005
-                memory.chat_memory.messages
+                memory.buffer_as_messages
                 if (use_memory and memory is not None)
                 else []
             ),
         )
-        | prompt
-        | llm
-        | JSONAgentOutputParser()
+        | RunnablePassthrough.assign(output=prompt | llm | CustomJSONAssistantOutputParser())
+        | RunnableLambda(_stop_on_repeated_action)
     )
 
-    return AgentExecutor(
+    return CachedAgentExecutor(
         agent=agent, tools=tools, handle_parsing_errors=True, verbose=True, memory=memory, max_iterations=5,
-        early_stopping_method="force"
+        early_stopping_method="force", semantic_cache=semantic_cache
     )
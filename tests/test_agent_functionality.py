@@ -27,33 +27,23 @@ def test_agent_with_tools():
         pytest.fail(f"Unexpected error occurred: {str(e)}")
 
 
-def test_individual_tools():
-    """Validates initialization of each tool independently."""
-    successful_tools = []
-    failed_tools = []
-
-    for tool_name in TOOL_FACTORY:
-        try:
-            assistant = BiocatalysisAssistant(tool_names=[tool_name])
-            tools = assistant.get_available_tools()
-            if tools:
-                successful_tools.append(tool_name)
-        except Exception as e:
-            failed_tools.append(f"{tool_name}: {str(e)}")
-
-    assert (
-        len(successful_tools) > 0
-    ), f"Critical failure: No tools could be initialized. Failures: {', '.join(failed_tools)}"
-
-
-def test_full_assistant():
+@pytest.mark.parametrize("tool_name", list(TOOL_FACTORY))
+def test_individual_tools(tool_name, full_assistant):
+    """Validates that each tool whose requirements are met is initialized."""
+    if not TOOL_FACTORY[tool_name].check_requirements():
+        pytest.skip(f"Requirements not met for {tool_name}.")
+
+    loaded_tools = {tool.name for tool in full_assistant.get_available_tools()}
+    assert tool_name in loaded_tools, f"Tool {tool_name} could not be initialized."
+
+
+def test_full_assistant(full_assistant):
     """Validates complete assistant initialization with all tools."""
-    assistant = BiocatalysisAssistant()
-    tools = assistant.get_available_tools()
+    tools = full_assistant.get_available_tools()
     assert tools, "No tools were loaded"
     assert len(tools) > 0, "No tools were successfully loaded"
 
-    agent = assistant.initiate_agent()
+    agent = full_assistant.initiate_agent()
     assert agent, "Agent initialization failed"
 
 
@@ -64,7 +54,13 @@ def setup_logging():
     return logging.getLogger(__name__)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def full_assistant():
+    """Provides an assistant with all tools, built once for the test session."""
+    return BiocatalysisAssistant()
+
+
+@pytest.fixture(scope="session")
 def mock_assistant():
-    """Provides a mock assistant for testing."""
+    """Provides a mock assistant for testing, built once for the test session."""
     return BiocatalysisAssistant()
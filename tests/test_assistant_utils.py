@@ -0,0 +1,166 @@
+"""Test suite for the agent executor utilities."""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+from langchain_core.agents import AgentAction, AgentFinish
+from langchain_core.exceptions import OutputParserException
+from langchain_core.tools import tool
+from lmabc.utils.assistant_utils import (
+    CustomJSONAssistantOutputParser,
+    ParallelTools,
+    SemanticCache,
+    _is_clean_finish,
+    _stop_on_repeated_action,
+)
+
+ACTION_JSON = '{"action": "ExtractBindingSites", "action_input": {"reaction_smiles": "CCO>>CC=O"}}'
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        ACTION_JSON,
+        f"```json\n{ACTION_JSON}\n```",
+        f"```\n{ACTION_JSON}\n```",
+        f"Thought: I need the binding sites.\nAction:\n```json\n{ACTION_JSON}\n```\n",
+    ],
+)
+def test_output_parser_action(text):
+    """Validates parsing of fenced and unfenced action blobs."""
+    result = CustomJSONAssistantOutputParser().parse(text)
+    assert isinstance(result, AgentAction)
+    assert result.tool == "ExtractBindingSites"
+    assert result.tool_input == {"reaction_smiles": "CCO>>CC=O"}
+    assert result.log == text
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('```json\n{"action": "Final Answer", "action_input": "Done."}\n```', "Done."),
+        ("  The binding sites are [(12, 20)].  ", "The binding sites are [(12, 20)]."),
+    ],
+)
+def test_output_parser_finish(text, expected):
+    """Validates that final answers and plain text outputs finish the run."""
+    result = CustomJSONAssistantOutputParser().parse(text)
+    assert isinstance(result, AgentFinish)
+    assert result.return_values == {"output": expected}
+
+
+def test_output_parser_invalid():
+    """Validates that a JSON blob without an action is rejected."""
+    with pytest.raises(OutputParserException):
+        CustomJSONAssistantOutputParser().parse('```json\n{"input": "CCO"}\n```')
+
+
+@pytest.fixture
+def parallel_tools():
+    """Provides a Parallel tool over stub tools, two of which must run at the same time."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    @tool
+    def wait(text: str) -> str:
+        """Return the text once another call is running too."""
+        barrier.wait()
+        return text
+
+    @tool
+    def fail(text: str) -> str:
+        """Always fail."""
+        raise ValueError(f"bad input {text}")
+
+    return ParallelTools(tools={t.name: t for t in (wait, fail)})
+
+
+PARALLEL_ACTIONS = [
+    {"action": "wait", "action_input": {"text": "a"}},
+    {"action": "fail", "action_input": {"text": "b"}},
+    {"action": "wait", "action_input": {"text": "c"}},
+    {"action": "missing", "action_input": "d"},
+]
+PARALLEL_OBSERVATIONS = (
+    "wait: a\nfail: Error: bad input b\nwait: c\nmissing: is not a valid tool."
+)
+
+
+def test_parallel_tools(parallel_tools):
+    """Validates that the actions run concurrently and their observations keep the order."""
+    assert parallel_tools.invoke({"actions": PARALLEL_ACTIONS}) == PARALLEL_OBSERVATIONS
+
+
+def test_parallel_tools_async(parallel_tools):
+    """Validates the async fan-out of the actions."""
+    observations = asyncio.run(parallel_tools.ainvoke({"actions": PARALLEL_ACTIONS}))
+    assert observations == PARALLEL_OBSERVATIONS
+
+
+class _ConstantEncoder:
+    """Sentence transformer stub embedding every question to the same vector."""
+
+    def encode(self, text, normalize_embeddings):  # noqa: ARG002
+        """Return a constant unit vector."""
+        return np.full(4, 0.5)
+
+
+def test_semantic_cache_requires_same_entities():
+    """Validates that similar questions only share answers when they name the same reaction."""
+    cache = SemanticCache()
+    cache._model = _ConstantEncoder()
+    question = "Find the binding sites of CC(=O)Cc1ccccc1|MTENALVR>>CC(O)Cc1ccccc1"
+
+    answer, embedding = cache.lookup(question)
+    assert answer is None
+    cache.add(question, embedding, "[(1, 4)]")
+
+    assert cache.lookup(f"{question}.")[0] == "[(1, 4)]"
+    assert cache.lookup(question.replace("MTENALVR", "MTENALVK"))[0] is None
+    assert cache.lookup(question.replace("Cc1ccccc1|", "Cc1ccncc1|"))[0] is None
+
+
+EXCEPTION_STEP = (AgentAction(tool="_Exception", tool_input="Invalid", log=""), "Invalid")
+TOOL_STEP = (AgentAction(tool="GetElementsOfReaction", tool_input="CCO>>CC=O", log=""), "CCO")
+
+
+@pytest.mark.parametrize(
+    "log, steps, expected",
+    [
+        ("Final Answer: CCO", [TOOL_STEP], True),
+        ("", [TOOL_STEP], False),
+        ("Stopped: the GetElementsOfReaction tool was called again.", [TOOL_STEP], False),
+        ("Final Answer: CCO", [EXCEPTION_STEP, TOOL_STEP], False),
+    ],
+)
+def test_is_clean_finish(log, steps, expected):
+    """Validates that stopped runs and runs with parsing errors are not cached."""
+    finish = AgentFinish(return_values={"output": "CCO"}, log=log)
+    assert _is_clean_finish(finish, steps) is expected
+
+
+def test_stop_on_repeated_action():
+    """Validates that a repeated action, whatever its key order, finishes the run."""
+    previous = AgentAction(tool="GetElementsOfReaction", tool_input={"a": 1, "b": [2]}, log="")
+    repeated = AgentAction(tool="GetElementsOfReaction", tool_input={"b": [2], "a": 1}, log="")
+
+    result = _stop_on_repeated_action(
+        {"output": repeated, "intermediate_steps": [(previous, "[(12, 20)]")]}
+    )
+    assert isinstance(result, AgentFinish)
+    assert result.return_values["output"].startswith("Stopped: the GetElementsOfReaction tool")
+    assert "[(12, 20)]" in result.return_values["output"]
+
+
+def test_stop_on_repeated_action_new_action():
+    """Validates that new actions and final answers are passed through."""
+    previous = AgentAction(tool="GetElementsOfReaction", tool_input="CC>>C", log="")
+    new = AgentAction(tool="GetElementsOfReaction", tool_input="CCO>>C", log="")
+    finish = AgentFinish(return_values={"output": "done"}, log="")
+
+    for output in (new, finish):
+        result = _stop_on_repeated_action(
+            {"output": output, "intermediate_steps": [(previous, "observation")]}
+        )
+        assert result is output
@@ -0,0 +1,110 @@
+"""Test suite for the Mutagenesis tool helpers."""
+
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+from lmabc.tools.mutagenesis import (
+    Mutagenesis,
+    _kabsch_rmsd,
+    _load_ca_coordinates,
+    _residue_names,
+)
+from scipy.spatial.transform import Rotation
+
+# Tripeptide with a SEQRES record, full backbone atoms and a calcium ion, whose
+# atom name "CA" must not be read as a CA atom.
+PDB_TEXT = """\
+SEQRES   1 A    3  ALA GLY ALA
+ATOM      1  N   ALA A   1      -1.200   0.500   0.000  1.00  0.00           N
+ATOM      2  CA  ALA A   1       0.000   0.000   0.000  1.00  0.00           C
+ATOM      3  C   ALA A   1       1.200   0.600   0.000  1.00  0.00           C
+ATOM      4  O   ALA A   1       1.200   1.800   0.000  1.00  0.00           O
+ATOM      5  CB  ALA A   1       0.000  -0.800   1.200  1.00  0.00           C
+ATOM      6  N   GLY A   2       2.600   0.500   0.000  1.00  0.00           N
+ATOM      7  CA  GLY A   2       3.800   0.000   0.000  1.00  0.00           C
+ATOM      8  C   GLY A   2       5.000   0.600   0.000  1.00  0.00           C
+ATOM      9  O   GLY A   2       5.000   1.800   0.000  1.00  0.00           O
+ATOM     10  N   ALA A   3       6.400   0.500   0.000  1.00  0.00           N
+ATOM     11  CA  ALA A   3       7.600   0.000   0.000  1.00  0.00           C
+ATOM     12  C   ALA A   3       8.800   0.600   0.000  1.00  0.00           C
+ATOM     13  O   ALA A   3       8.800   1.800   0.000  1.00  0.00           O
+ATOM     14  CB  ALA A   3       7.600  -0.800   1.200  1.00  0.00           C
+HETATM   15 CA    CA A 101      10.000  10.000  10.000  1.00  0.00          CA
+END
+"""
+
+
+@pytest.fixture
+def pdb_file(tmp_path):
+    """Provides the tripeptide PDB file."""
+    path = tmp_path / "tripeptide.pdb"
+    path.write_text(PDB_TEXT)
+    return path
+
+
+def test_load_pdb(pdb_file):
+    """Validates the SEQRES and CA parsing, skipping the calcium ion and other chains."""
+    pdb_file.write_text(
+        PDB_TEXT.replace("SEQRES   1 A", "SEQRES   1 B    2  GLY GLY\nSEQRES   1 A", 1)
+    )
+    chain_id, sequence, coordinates = Mutagenesis._load_pdb(pdb_file)
+    assert chain_id == "B"
+    assert sequence == "GG"
+
+    pdb_file.write_text(PDB_TEXT)
+    chain_id, sequence, coordinates = Mutagenesis._load_pdb(pdb_file)
+    expected = np.array([[0.0, 0.0, 0.0], [3.8, 0.0, 0.0], [7.6, 0.0, 0.0]])
+    assert chain_id == "A"
+    assert sequence == "AGA"
+    np.testing.assert_allclose(coordinates, expected)
+    np.testing.assert_allclose(_load_ca_coordinates(pdb_file), expected)
+
+
+def test_load_ca_coordinates_rewritten(pdb_file):
+    """Validates that a file rewritten with the same modification time is read again."""
+    mtime_ns = pdb_file.stat().st_mtime_ns
+    assert len(_load_ca_coordinates(pdb_file)) == 3
+
+    pdb_file.write_text("".join(line for line in PDB_TEXT.splitlines(True) if "11  CA" not in line))
+    os.utime(pdb_file, ns=(mtime_ns, mtime_ns))
+    assert len(_load_ca_coordinates(pdb_file)) == 2
+
+
+def test_residue_names(pdb_file):
+    """Validates the residue names read back from a saved structure."""
+    assert _residue_names(pdb_file) == {"1": {"ALA"}, "2": {"GLY"}, "3": {"ALA"}}
+
+
+def test_kabsch_rmsd():
+    """Validates the RMSD after superposition against SciPy's rotation alignment."""
+    rng = np.random.default_rng(0)
+    reference = rng.normal(scale=5.0, size=(20, 3))
+    moving = (
+        Rotation.random(random_state=1).apply(reference)
+        + np.array([1.0, 2.0, 3.0])
+        + rng.normal(scale=0.3, size=(20, 3))
+    )
+
+    _, rssd = Rotation.align_vectors(
+        reference - reference.mean(axis=0), moving - moving.mean(axis=0)
+    )
+    assert _kabsch_rmsd(reference, moving) == pytest.approx(rssd / np.sqrt(len(reference)))
+    assert _kabsch_rmsd(reference, reference + 1.0) == pytest.approx(0.0, abs=1e-9)
+
+
+@pytest.mark.skipif(importlib.util.find_spec("pymol") is None, reason="PyMOL is not installed.")
+def test_perform_mutations(pdb_file, tmp_path):
+    """Validates a mutation run end to end through the PyMOL worker."""
+    output_file = tmp_path / "tripeptide_mutated.pdb"
+    mutations = Mutagenesis.find_mutations("AGA", "AAA")
+    Mutagenesis.perform_mutations(pdb_file, mutations, output_file)
+
+    residues = {
+        (line[22:26].strip(), line[17:20])
+        for line in output_file.read_text().splitlines()
+        if line.startswith("ATOM")
+    }
+    assert ("2", "ALA") in residues
+    assert ("2", "GLY") not in residues
@@ -0,0 +1,87 @@
+"""Test suite for the PDB tool helpers."""
+
+import asyncio
+
+import pytest
+from lmabc.tools import pdb
+from lmabc.tools.pdb import FindPDBStructure
+
+
+@pytest.mark.skipif(pdb.aiohttp is None, reason="aiohttp is not installed.")
+def test_search_async_returns_highest_ranked_match(monkeypatch):
+    """Validates that the first ranked match wins even when a lower-ranked one answers first."""
+    delays = {"1ABC": 0.05, "2ABC": 0.0, "3ABC": 0.0}
+    sequences = {"1ABC": "MKV", "2ABC": "MKV", "3ABC": "MKL"}
+
+    async def fetch(session, entry_id, entity_id):  # noqa: ARG001
+        await asyncio.sleep(delays[entry_id])
+        return sequences[entry_id]
+
+    monkeypatch.setattr(FindPDBStructure, "_fetch", staticmethod(fetch))
+    match = asyncio.run(
+        FindPDBStructure()._search_async(["3ABC_1", "1ABC_1", "2ABC_1"], "MKV")
+    )
+    assert match == ("1ABC", "1")
+
+
+class _Response:
+    """aiohttp response stub with a fixed status."""
+
+    def __init__(self, status):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+    async def read(self):
+        return b'{"entity_poly": {"pdbx_seq_one_letter_code_can": "MKV"}}'
+
+
+class _Session:
+    """aiohttp session stub answering with the given statuses in turn."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+
+    def get(self, url, headers):  # noqa: ARG002
+        return _Response(self.statuses.pop(0))
+
+
+@pytest.mark.skipif(pdb.aiohttp is None, reason="aiohttp is not installed.")
+@pytest.mark.parametrize(
+    "statuses, expected",
+    [([503, 429, 200], "MKV"), ([404], None), ([500, 500, 500, 500], RuntimeError)],
+)
+def test_fetch_retries_transient_errors(monkeypatch, statuses, expected):
+    """Validates that rate limits and server errors are retried, then raised, not skipped."""
+    monkeypatch.setattr(pdb, "_BACKOFF", 0.0)
+    monkeypatch.setattr(pdb, "_read_cached_sequence", lambda *_: None)
+    monkeypatch.setattr(pdb, "_write_cached_sequence", lambda *_: None)
+    session = _Session(statuses)
+
+    fetch = FindPDBStructure._fetch(session, "1ABC", "1")
+    if expected is RuntimeError:
+        with pytest.raises(RuntimeError):
+            asyncio.run(fetch)
+    else:
+        assert asyncio.run(fetch) == expected
+    assert session.statuses == []
+
+
+def test_write_json_atomic(tmp_path):
+    """Validates that cache files are written and that write failures are not raised."""
+    path = tmp_path / "cache" / "entry.json"
+    pdb._write_json_atomic(path, ["1ABC_1"])
+    assert path.read_text() == '["1ABC_1"]'
+    assert list(path.parent.iterdir()) == [path]
+
+    blocked = tmp_path / "file"
+    blocked.write_text("")
+    pdb._write_json_atomic(blocked / "entry.json", ["1ABC_1"])
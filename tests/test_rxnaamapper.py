@@ -0,0 +1,96 @@
+"""Test suite for the RXNAAMapper tool helpers."""
+
+import asyncio
+
+import pytest
+import torch
+from lmabc.tools import rxnaamapper
+
+
+class _StubMapper:
+    """Stands in for RXNAAMapper, without loading a tokenizer or model from disk."""
+
+    def __init__(self, config):
+        """Build a small torch model in training mode."""
+        self.config = config
+        self.model = torch.nn.Linear(2, 2)
+
+    def get_reactant_aa_sequence_attention_guided_maps(self, rxns):  # noqa: ARG002
+        """Return no maps."""
+        return []
+
+
+@pytest.fixture
+def stub_mapper(monkeypatch):
+    """Replaces RXNAAMapper with a stub and clears the cached mapper around the test."""
+    monkeypatch.setattr(rxnaamapper, "RXNAAMapper", _StubMapper)
+    rxnaamapper._load_mapper.cache_clear()
+    yield
+    rxnaamapper._load_mapper.cache_clear()
+
+
+@pytest.mark.usefixtures("stub_mapper")
+def test_load_mapper():
+    """Validates that the loaded model is put in eval mode and keeps float32 weights."""
+    mapper = rxnaamapper._load_mapper()
+    assert isinstance(mapper, _StubMapper)
+    assert not mapper.model.training
+    assert mapper.model.weight.dtype == torch.float32
+
+
+@pytest.mark.usefixtures("stub_mapper")
+def test_load_mapper_bfloat16(monkeypatch):
+    """Validates the opt-in cast of the model weights."""
+    monkeypatch.setattr(rxnaamapper.RXNAAMAPPER_SETTINGS, "dtype", "bfloat16")
+    mapper = rxnaamapper._load_mapper()
+    assert not mapper.model.training
+    assert mapper.model.weight.dtype == torch.bfloat16
+
+
+def test_batcher_consumer_failure(monkeypatch):
+    """Validates that requests fail, instead of hanging, when the batch consumer dies."""
+    monkeypatch.setattr(rxnaamapper.RXNAAMAPPER_SETTINGS, "max_batch_size", 1)
+    monkeypatch.setattr(rxnaamapper, "_extract_binding_sites", lambda _: None)
+    batcher = rxnaamapper._ReactionBatcher()
+
+    async def run():
+        failed = await asyncio.gather(
+            batcher.submit("CCO>>CC=O"), batcher.submit("CC>>C"), return_exceptions=True
+        )
+        monkeypatch.setattr(
+            rxnaamapper, "_extract_binding_sites", lambda rxns: ["[(1, 2)]"] * len(rxns)
+        )
+        return failed, await batcher.submit("CCO>>CC=O")
+
+    failed, result = asyncio.run(run())
+    assert all(isinstance(error, TypeError) for error in failed)
+    assert result == "[(1, 2)]"
+
+
+def test_extract_binding_sites_empty():
+    """Validates that an empty reaction gets a message and an empty list an empty list."""
+    tool = rxnaamapper.ExtractBindingSites()
+    assert tool._run("") == "Reaction SMILES string is empty."
+    assert tool._run([]) == []
+    assert asyncio.run(tool._arun([])) == []
+
+
+@pytest.mark.parametrize(
+    "rxn, expected",
+    [
+        (
+            "CC(=O)Cc1ccccc1|MTENALVR>>CC(O)Cc1ccccc1",
+            ("CC(=O)Cc1ccccc1", "MTENALVR", "CC(O)Cc1ccccc1"),
+        ),
+        (" CCO | MTEN >> CC=O ", ("CCO", "MTEN", "CC=O")),
+        ("CC(=O)Cc1ccccc1|MTENALVR", ("CC(=O)Cc1ccccc1", "MTENALVR", "")),
+        ("CCO>>CC=O", ("CCO", "", "CC=O")),
+        ("CCO|MTEN>>CC=O |f:0.1|", ("CCO", "MTEN", "CC=O |f:0.1|")),
+        ("CCO>>CC=O |f:0.1|", ("CCO", "", "CC=O |f:0.1|")),
+        ("CCO", ("CCO", "", "")),
+        ("", ("", "", "")),
+    ],
+)
+def test_split_reaction(rxn, expected):
+    """Validates splitting reactions with and without the sequence and products."""
+    assert rxnaamapper._split_reaction(rxn) == expected
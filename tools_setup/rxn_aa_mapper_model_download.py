@@ -1,38 +1,77 @@
 """Model setup for RXNAAMapper"""
 
 
+import hashlib
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import click
-from rxn_aa_mapper.model import EnzymaticReactionLightningModule
-from rxn_aa_mapper.tokenization import LMEnzymaticReactionTokenizer
+# The script only copies tensors, set the thread pools to one thread before torch starts them.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+import click  # noqa: E402
+import torch  # noqa: E402
+
+torch.set_num_threads(1)
+torch.set_num_interop_threads(1)
+
+from rxn_aa_mapper.model import EnzymaticReactionLightningModule  # noqa: E402
+from rxn_aa_mapper.tokenization import LMEnzymaticReactionTokenizer  # noqa: E402
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+MODEL_NAME = "google-bert/bert-base-uncased"
+
+
+def vocabulary_fingerprint(cache_dir):
+    """Fingerprint of the vocabulary and base model the saved model was resized for."""
+    digest = hashlib.sha256()
+    with (cache_dir / "vocabulary.txt").open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return f"{digest.hexdigest()} {MODEL_NAME}"
+
+
 def download_bert_model(cache_dir):
     """Download and save the BERT model to the cache directory."""
     model_path = cache_dir / "model"
+    fingerprint_path = model_path / ".fingerprint"
+    fingerprint = vocabulary_fingerprint(cache_dir)
 
-    if not model_path.exists():
-        logger.info("Downloading and saving BERT model...")
-        model = EnzymaticReactionLightningModule(
-            model_architecture={}, model_args={"model": "google-bert/bert-base-uncased"}
-        )
+    if fingerprint_path.exists() and fingerprint_path.read_text() == fingerprint:
+        logger.info(f"Model already exists at {model_path}")
+        return
 
-        tokenizer = LMEnzymaticReactionTokenizer(
+    if model_path.exists():
+        # Also covers models saved before fingerprints were recorded, their
+        # vocabulary is unknown.
+        logger.info(f"Model at {model_path} does not match the vocabulary, rebuilding it.")
+
+    logger.info("Downloading and saving BERT model...")
+    # The model download and the tokenizer loading are independent, overlap them.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        model_future = executor.submit(
+            EnzymaticReactionLightningModule,
+            model_architecture={},
+            model_args={"model": MODEL_NAME},
+        )
+        tokenizer_future = executor.submit(
+            LMEnzymaticReactionTokenizer,
             vocabulary_file=str(cache_dir / "vocabulary.txt"),
             aa_sequence_tokenizer_filepath=str(cache_dir / "tokenizer.json"),
             aa_sequence_tokenizer_type="generic",
         )
+        model = model_future.result()
+        tokenizer = tokenizer_future.result()
 
-        vocab_size = tokenizer.vocab_size
-        model.model.resize_token_embeddings(vocab_size)
+    vocab_size = tokenizer.vocab_size
+    model.model.resize_token_embeddings(vocab_size)
 
-        model.model.save_pretrained(model_path, safe_serialization=False)
-    else:
-        logger.info(f"Model already exists at {model_path}")
+    model.model.save_pretrained(model_path, safe_serialization=True)
+    fingerprint_path.write_text(fingerprint)
 
 @click.command()
 @click.argument('cache_dir', type=click.Path(exists=True))